@@ -17,11 +17,14 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import sys
 import os
+import shutil
 import click
 
 from datetime import datetime, timedelta
 from redis import StrictRedis
+from redis.exceptions import ConnectionError as RedisConnectionError, ResponseError
 from rq import Queue
+from rq.utils import utcformat
 from subprocess import Popen
 from time import sleep
 import platform
@@ -30,6 +33,27 @@ from gsy_e.gsy_e_core.util import get_simulation_queue_name
 
 REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost')
 MAX_JOBS = os.environ.get('D3A_MAX_JOBS_PER_POD', 2)
+# Keyspace events (K) for list commands (l), enough to observe jobs being enqueued
+QUEUE_KEYSPACE_EVENT_FLAGS = "Kl"
+
+# Returns 1 if any job in the queue was enqueued before ARGV[2], i.e. if the oldest job has
+# waited for too long. Jobs enqueued with at_front do not keep the list ordered by age, so
+# every id is visited until an old enough job is found. Ids whose job hash is gone (expired
+# or deleted jobs) are removed from the queue, like RQ does when fetching the queue jobs.
+# RQ stores enqueued_at in a fixed-width UTC format, therefore a string comparison is
+# sufficient.
+IS_QUEUE_CROWDED_SCRIPT = """
+for _, job_id in ipairs(redis.call('LRANGE', KEYS[1], 0, -1)) do
+    local job_key = ARGV[1] .. job_id
+    if redis.call('EXISTS', job_key) == 0 then
+        redis.call('LREM', KEYS[1], 0, job_id)
+    else
+        local enqueued_at = redis.call('HGET', job_key, 'enqueued_at')
+        if enqueued_at and enqueued_at <= ARGV[2] then return 1 end
+    end
+end
+return 0
+"""
 
 
 class Launcher:
@@ -38,34 +62,83 @@ class Launcher:
         self.queue = Queue(get_simulation_queue_name(), connection=self.redis_connection)
         self.max_jobs = max_jobs if max_jobs is not None else int(MAX_JOBS)
         self.max_delay = timedelta(seconds=max_delay_seconds)
+        # Script objects cache their SHA and are executed via EVALSHA.
+        self._is_queue_crowded_script = self.redis_connection.register_script(
+            IS_QUEUE_CROWDED_SCRIPT)
+        # posix_spawn is only used by Popen for executables given with their full path
         python_executable = sys.executable \
             if platform.python_implementation() != "PyPy" \
-            else "pypy3"
+            else shutil.which("pypy3") or "pypy3"
         self.command = [python_executable, 'src/gsy_e/gsy_e_core/exchange_jobs.py']
         self.job_array = []
 
     def run(self):
         self.job_array.append(self._start_worker())
+        queue_events = None
         while True:
-            sleep(1)
+            queue_events = self._wait_for_queue_event(queue_events)
+            # Reap finished workers first, so that their slots can be reused right away
+            self.job_array = [j for j in self.job_array if j.poll() is None]
             if len(self.job_array) < self.max_jobs and self.is_queue_crowded():
                 self.job_array.append(self._start_worker())
 
-            self.job_array = [j for j in self.job_array if j.poll() is None]
+    def _wait_for_queue_event(self, queue_events):
+        """Block until the queue list changes or until max_delay expires, whichever comes first.
+
+        Returns the subscription to wait on in the next iteration, or None if it has to be
+        re-established. Without keyspace notifications this degrades to a timed wait.
+        """
+        try:
+            if queue_events is None:
+                queue_events = self._subscribe_to_queue_events()
+            queue_events.get_message(timeout=self.max_delay.total_seconds())
+            return queue_events
+        except RedisConnectionError:
+            # The connection to Redis dropped, wait for max_delay and resubscribe afterwards
+            if queue_events is not None:
+                queue_events.close()
+            sleep(self.max_delay.total_seconds())
+            return None
+
+    def _subscribe_to_queue_events(self):
+        try:
+            self._enable_queue_keyspace_events()
+        except ResponseError:
+            # Managed Redis instances may refuse CONFIG GET / SET, notifications have to be
+            # enabled on the server in this case.
+            pass
+        db = self.redis_connection.connection_pool.connection_kwargs.get("db", 0)
+        pubsub = self.redis_connection.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(f"__keyspace@{db}__:{self.queue.key}")
+        return pubsub
+
+    def _enable_queue_keyspace_events(self):
+        """Add the flags needed by the launcher to the server-wide notification settings.
+
+        Flags that are already set are kept, other clients of the same Redis may rely on them.
+        """
+        current_flags = self.redis_connection.config_get(
+            "notify-keyspace-events").get("notify-keyspace-events", "")
+        missing_flags = "".join(
+            flag for flag in QUEUE_KEYSPACE_EVENT_FLAGS if flag not in current_flags)
+        if missing_flags:
+            self.redis_connection.config_set(
+                "notify-keyspace-events", current_flags + missing_flags)
 
     def is_queue_crowded(self):
         check_redis_health(redis_db=self.redis_connection)
-        enqueued = self.queue.jobs
-        if enqueued:
-            earliest = min(job.enqueued_at for job in enqueued)
-            if datetime.utcnow() - earliest >= self.max_delay:
-                return True
-        return False
+        return bool(self._is_queue_crowded_script(
+            keys=[self.queue.key],
+            args=[self.queue.job_class.redis_job_namespace_prefix,
+                  utcformat(datetime.utcnow() - self.max_delay)]))
 
     def _start_worker(self):
         job_environment = os.environ
         job_environment['REDIS_URL'] = REDIS_URL
-        return Popen(self.command, env=job_environment)
+        # Without close_fds, Popen can use posix_spawn instead of fork + exec, which avoids
+        # copying the page tables of the launcher. Descriptors opened by Python are
+        # non-inheritable by default (PEP 446), so the workers do not inherit Redis sockets.
+        return Popen(self.command, env=job_environment, close_fds=False)
 
 
 @click.command()
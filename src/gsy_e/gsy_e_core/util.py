@@ -522,12 +522,17 @@ class StrategyProfileConfigurationException(Exception):
     """Exception raised when neither a profile nor a profile_uuid are provided for a strategy."""
 
 
+def get_past_markets_threshold(current_time_slot: DateTime) -> DateTime:
+    """Return the time slot before which markets belong to the area.past_markets."""
+    if ConstSettings.SettlementMarketSettings.ENABLE_SETTLEMENT_MARKETS:
+        return current_time_slot.subtract(
+            hours=ConstSettings.SettlementMarketSettings.MAX_AGE_SETTLEMENT_MARKET_HOURS)
+    return current_time_slot
+
+
 def is_time_slot_in_past_markets(time_slot: DateTime, current_time_slot: DateTime):
     """Checks if the time_slot should be in the area.past_markets."""
-    if ConstSettings.SettlementMarketSettings.ENABLE_SETTLEMENT_MARKETS:
-        return (time_slot < current_time_slot.subtract(
-            hours=ConstSettings.SettlementMarketSettings.MAX_AGE_SETTLEMENT_MARKET_HOURS))
-    return time_slot < current_time_slot
+    return time_slot < get_past_markets_threshold(current_time_slot)
 
 
 class FutureMarketCounter:
@@ -16,7 +16,7 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 from logging import getLogger
-from typing import Union, Dict, TYPE_CHECKING, Optional
+from typing import Union, Dict, TYPE_CHECKING, Optional, Tuple
 
 from gsy_framework.constants_limits import ConstSettings
 from gsy_framework.enums import SpotMarketTypeEnum
@@ -56,6 +56,18 @@ class AreaDispatcher:
     if the area has no strategy, to broadcast the events to the children of the area. Maintain
     dicts with interarea agents for each market type.
     """
+    # Name of the member that holds the agents of each market type, future markets have only one
+    # agent and are therefore handled separately.
+    _AGENTS_MEMBER_FOR_MARKET_TYPE = {
+        AvailableMarketTypes.SPOT: "spot_agents",
+        AvailableMarketTypes.BALANCING: "balancing_agents",
+        AvailableMarketTypes.SETTLEMENT: "settlement_agents",
+    }
+    # Area events are broadcast to the agents of all market types, in this order
+    _AREA_EVENT_MARKET_TYPES = (
+        AvailableMarketTypes.SPOT, AvailableMarketTypes.BALANCING,
+        AvailableMarketTypes.SETTLEMENT, AvailableMarketTypes.FUTURE)
+
     def __init__(self, area: "Area"):
         self._spot_agents: Dict[DateTime, OneSidedAgent] = {}
         self._balancing_agents: Dict[DateTime, BalancingAgent] = {}
@@ -172,24 +184,28 @@ class AreaDispatcher:
         for child in sorted(self.area.children, key=lambda _: random()):
             child.dispatcher.event_listener(event_type, **kwargs)
 
-        market_id = kwargs.get("market_id")
-        if not market_id and isinstance(event_type, MarketEvent):
+        for market_type in self._get_market_types_for_event(event_type, kwargs.get("market_id")):
+            self._broadcast_notification_to_area_and_child_agents(
+                market_type, event_type, **kwargs)
+
+    def _get_market_types_for_event(
+            self, event_type: Union[MarketEvent, AreaEvent],
+            market_id: Optional[str]) -> Tuple[AvailableMarketTypes, ...]:
+        """Return the market types whose agents should be notified about the event."""
+        if isinstance(event_type, AreaEvent):
+            return self._AREA_EVENT_MARKET_TYPES
+        if not market_id:
             assert False, "MarketEvent should always provide a market_id."
-        if (isinstance(event_type, AreaEvent)
-                or self.area.is_market_spot(market_id)
-                or self.area.is_market_balancing(market_id)):
+        market_types = ()
+        if self.area.is_market_spot(market_id) or self.area.is_market_balancing(market_id):
             # Both spot and balancing agents need to be informed about each others events.
             # To be changed when updating the balancing market feature.
-            self._broadcast_notification_to_area_and_child_agents(
-                AvailableMarketTypes.SPOT, event_type, **kwargs)
-            self._broadcast_notification_to_area_and_child_agents(
-                AvailableMarketTypes.BALANCING, event_type, **kwargs)
-        if isinstance(event_type, AreaEvent) or self.area.is_market_settlement(market_id):
-            self._broadcast_notification_to_area_and_child_agents(
-                AvailableMarketTypes.SETTLEMENT, event_type, **kwargs)
-        if isinstance(event_type, AreaEvent) or self.area.is_market_future(market_id):
-            self._broadcast_notification_to_area_and_child_agents(
-                AvailableMarketTypes.FUTURE, event_type, **kwargs)
+            market_types += (AvailableMarketTypes.SPOT, AvailableMarketTypes.BALANCING)
+        if self.area.is_market_settlement(market_id):
+            market_types += (AvailableMarketTypes.SETTLEMENT,)
+        if self.area.is_market_future(market_id):
+            market_types += (AvailableMarketTypes.FUTURE,)
+        return market_types
 
     def _should_dispatch_to_strategies(self, event_type: Union[AreaEvent, MarketEvent]) -> bool:
         if event_type is AreaEvent.ACTIVATE:
@@ -253,17 +269,13 @@ class AreaDispatcher:
 
         assert False, f"Market type not supported {market_type}"
 
-    @staticmethod
+    @classmethod
     def _get_agents_for_market_type(
-            dispatcher_object, market_type: AvailableMarketTypes
+            cls, dispatcher_object, market_type: AvailableMarketTypes
     ) -> Dict[DateTime, Union[OneSidedAgent, BalancingAgent, SettlementAgent]]:
-        if market_type == AvailableMarketTypes.SPOT:
-            return dispatcher_object.spot_agents
-        if market_type == AvailableMarketTypes.BALANCING:
-            return dispatcher_object.balancing_agents
-        if market_type == AvailableMarketTypes.SETTLEMENT:
-            return dispatcher_object.settlement_agents
-        assert False, f"Market type not supported {market_type}"
+        agents_member = cls._AGENTS_MEMBER_FOR_MARKET_TYPE.get(market_type)
+        assert agents_member is not None, f"Market type not supported {market_type}"
+        return getattr(dispatcher_object, agents_member)
 
     @property
     def _should_agent_be_created(self) -> bool:
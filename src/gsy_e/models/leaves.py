@@ -74,11 +74,12 @@ class Leaf(Area):
                 except KeyError:
                     logging.error(f"{self.strategy_type} could not be found "
                                   f"in external_strategies_mapping, using template strategy.")
+        strategy_parameters = frozenset(self.strategy_type.parameters or ())
         super(Leaf, self).__init__(
             name=name,
             strategy=self.strategy_type(**{
                 key: value for key, value in kwargs.items()
-                if key in (self.strategy_type.parameters or []) and value is not None
+                if key in strategy_parameters and value is not None
             }),
             config=config,
             uuid=uuid
@@ -16,7 +16,8 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import uuid
-from logging import getLogger
+from itertools import count
+from logging import DEBUG, getLogger
 from typing import Union, Dict, List, Optional  # noqa
 
 from gsy_framework.constants_limits import ConstSettings
@@ -31,6 +32,7 @@ from gsy_e.gsy_e_core.exceptions import (
     InvalidOffer, MarketReadOnlyException,
     OfferNotFoundException, InvalidBalancingTradeException, DeviceNotInRegistryError)
 from gsy_e.gsy_e_core.util import short_offer_bid_log_str
+from gsy_e.models.market import GridFee
 from gsy_e.models.market.one_sided import OneSidedMarket
 
 log = getLogger(__name__)
@@ -49,10 +51,19 @@ class BalancingMarket(OneSidedMarket):
         self.accumulated_supply_balancing_trade_energy = 0
         self.accumulated_demand_balancing_trade_price = 0
         self.accumulated_demand_balancing_trade_energy = 0
+        # Offer ids keep the UUID format: a random 24-character UUID prefix per market, followed
+        # by a 12-digit hexadecimal counter in place of the last UUID group.
+        self._offer_id_prefix = str(uuid.uuid4())[:24]
+        self._offer_id_counter = count(1)
 
         super().__init__(time_slot, bc, notification_listener, readonly, grid_fee_type,
                          grid_fees, name, in_sim_duration=in_sim_duration)
 
+    def _create_fee_handler(self, grid_fee_type: int, grid_fees: GridFee) -> None:
+        super()._create_fee_handler(grid_fee_type, grid_fees)
+        # The fee model only changes together with the fee handler, store its type once
+        self._has_constant_fees = self._is_constant_fees
+
     def offer(  # pylint: disable=too-many-arguments
             self, price: float, energy: float, seller: str, seller_origin: str,
             offer_id: Optional[str] = None,
@@ -75,7 +86,7 @@ class BalancingMarket(OneSidedMarket):
             requirements: List[Dict] = None) -> BalancingOffer:
         """Create a balancing offer."""
 
-        if seller not in DeviceRegistry.REGISTRY.keys() and not from_agent:
+        if not from_agent and seller not in DeviceRegistry.REGISTRY:
             raise DeviceNotInRegistryError(f"Device {seller} "
                                            f"not in registry ({DeviceRegistry.REGISTRY}).")
         if self.readonly:
@@ -83,14 +94,28 @@ class BalancingMarket(OneSidedMarket):
         if energy == 0:
             raise InvalidOffer()
         if adapt_price_with_fees:
-            if self._is_constant_fees:
-                price = price + self.fee_class.grid_fee_rate * energy
+            grid_fee_rate = self.fee_class.grid_fee_rate
+            if self._has_constant_fees:
+                price = price + grid_fee_rate * energy
             else:
-                price = price * (1 + self.fee_class.grid_fee_rate)
+                price = price * (1 + grid_fee_rate)
 
         if offer_id is None:
-            offer_id = str(uuid.uuid4())
+            offer_id = self._next_offer_id()
+
+        offer = self._record_offer(offer_id, price, energy, seller, seller_origin,
+                                   attributes, requirements)
+        if dispatch_event is True:
+            self._notify_listeners(MarketEvent.BALANCING_OFFER, offer=offer)
+        return offer
+
+    def _next_offer_id(self) -> str:
+        return f"{self._offer_id_prefix}{next(self._offer_id_counter):012x}"
 
+    def _record_offer(  # pylint: disable=too-many-arguments
+            self, offer_id: str, price: float, energy: float, seller: str, seller_origin,
+            attributes: Optional[Dict], requirements: Optional[List[Dict]]) -> BalancingOffer:
+        """Create a balancing offer and add it to the market, without any validation."""
         offer = BalancingOffer(
             offer_id, self.now, price, energy, seller,
             seller_origin=seller_origin, attributes=attributes,
@@ -99,48 +124,39 @@ class BalancingMarket(OneSidedMarket):
 
         self.offer_history.append(offer)
         log.debug("[BALANCING_OFFER][NEW][%s] %s", self.time_slot_str, offer)
-        if dispatch_event is True:
-            self._notify_listeners(MarketEvent.BALANCING_OFFER, offer=offer)
         return offer
 
-    def split_offer(self, original_offer, energy, orig_offer_price=None):
+    def split_offer(self, original_offer, energy,
+                    orig_offer_price=None):  # pylint: disable=unused-argument
+        # orig_offer_price is unused, it is kept for signature compatibility with
+        # OneSidedMarket.split_offer, which the MA engines call on either market type.
+        # Both parts of a split have non-zero energy and are posted on behalf of the original
+        # seller, so only the read-only check of balancing_offer applies to them.
+        if self.readonly:
+            raise MarketReadOnlyException()
 
         self.offers.pop(original_offer.id, None)
         # same offer id is used for the new accepted_offer
 
-        accepted_offer = self.balancing_offer(offer_id=original_offer.id,
-                                              price=original_offer.price *
-                                              (energy / original_offer.energy),
-                                              energy=energy,
-                                              seller=original_offer.seller,
-                                              dispatch_event=False,
-                                              seller_origin=original_offer.seller_origin,
-                                              from_agent=True,
-                                              attributes=original_offer.attributes,
-                                              requirements=original_offer.requirements)
-
-        residual_price = (1 - energy / original_offer.energy) * original_offer.price
-        residual_energy = original_offer.energy - energy
-        if orig_offer_price is None:
-            orig_offer_price = original_offer.original_price or original_offer.price
-        original_residual_price = (
-                ((original_offer.energy - energy) / original_offer.energy) * orig_offer_price)
-
-        residual_offer = self.balancing_offer(price=residual_price,
-                                              energy=residual_energy,
-                                              seller=original_offer.seller,
-                                              original_price=original_residual_price,
-                                              dispatch_event=False,
-                                              seller_origin=original_offer.seller_origin,
-                                              adapt_price_with_fees=False,
-                                              from_agent=True,
-                                              attributes=original_offer.attributes,
-                                              requirements=original_offer.requirements)
-
-        log.debug(
-            "[BALANCING_OFFER][SPLIT][%s, %s] (%s into %s and %s",
-            self.time_slot_str, self.name, short_offer_bid_log_str(original_offer),
-            short_offer_bid_log_str(accepted_offer), short_offer_bid_log_str(residual_offer))
+        energy_portion = energy / original_offer.energy
+        accepted_offer = self._record_offer(
+            original_offer.id, original_offer.price * energy_portion, energy,
+            original_offer.seller, original_offer.seller_origin,
+            original_offer.attributes, original_offer.requirements)
+
+        # BalancingOffer does not track the original price, hence none is computed for the
+        # residual offer.
+        residual_offer = self._record_offer(
+            self._next_offer_id(), (1 - energy_portion) * original_offer.price,
+            original_offer.energy - energy,
+            original_offer.seller, original_offer.seller_origin,
+            original_offer.attributes, original_offer.requirements)
+
+        if log.isEnabledFor(DEBUG):
+            log.debug(
+                "[BALANCING_OFFER][SPLIT][%s, %s] (%s into %s and %s",
+                self.time_slot_str, self.name, short_offer_bid_log_str(original_offer),
+                short_offer_bid_log_str(accepted_offer), short_offer_bid_log_str(residual_offer))
 
         self.bc_interface.change_offer(accepted_offer, original_offer, residual_offer)
 
@@ -169,7 +185,9 @@ class BalancingMarket(OneSidedMarket):
 
         if isinstance(offer_or_id, Offer):
             offer_or_id = offer_or_id.id
-        offer = self.offers.pop(offer_or_id, None)
+        # The offer is only removed from self.offers once the trade is certain, so that failed
+        # trades leave it in place and do not change the order of the offers.
+        offer = self.offers.get(offer_or_id)
         if offer is None:
             raise OfferNotFoundException()
 
@@ -213,7 +231,7 @@ class BalancingMarket(OneSidedMarket):
                 offer.update_price(trade_price)
 
         except Exception:
-            # Exception happened - restore offer
+            # Exception happened - restore offer in case split_offer already removed it
             self.offers[offer.id] = offer
             raise
 
@@ -254,12 +272,13 @@ class BalancingMarket(OneSidedMarket):
         self._notify_listeners(MarketEvent.BALANCING_OFFER_DELETED, offer=offer)
 
     def _update_accumulated_trade_price_energy(self, trade):
-        if trade.traded_energy > 0:
+        traded_energy = trade.traded_energy
+        if traded_energy > 0:
             self.accumulated_supply_balancing_trade_price += trade.trade_price
-            self.accumulated_supply_balancing_trade_energy += trade.traded_energy
-        elif trade.traded_energy < 0:
+            self.accumulated_supply_balancing_trade_energy += traded_energy
+        elif traded_energy < 0:
             self.accumulated_demand_balancing_trade_price += trade.trade_price
-            self.accumulated_demand_balancing_trade_energy += abs(trade.traded_energy)
+            self.accumulated_demand_balancing_trade_energy -= traded_energy
 
     @property
     def avg_supply_balancing_trade_rate(self) -> float:
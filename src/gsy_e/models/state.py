@@ -28,7 +28,7 @@ from gsy_framework.utils import (
 from pendulum import DateTime
 
 from gsy_e.constants import FLOATING_POINT_TOLERANCE
-from gsy_e.gsy_e_core.util import is_time_slot_in_past_markets, write_default_to_dict
+from gsy_e.gsy_e_core.util import get_past_markets_threshold, write_default_to_dict
 
 StorageSettings = ConstSettings.StorageSettings
 
@@ -270,10 +270,9 @@ class ConsumptionState(ProsumptionInterface):
 
     def delete_past_state_values(self, current_time_slot: DateTime):
         """Delete data regarding energy consumption for past market slots."""
-        to_delete = []
-        for market_slot in self._energy_requirement_Wh:
-            if is_time_slot_in_past_markets(market_slot, current_time_slot):
-                to_delete.append(market_slot)
+        past_markets_threshold = get_past_markets_threshold(current_time_slot)
+        to_delete = [market_slot for market_slot in self._energy_requirement_Wh
+                     if market_slot < past_markets_threshold]
 
         for market_slot in to_delete:
             self._energy_requirement_Wh.pop(market_slot, None)
@@ -345,10 +344,9 @@ class ProductionState(ProsumptionInterface):
 
     def delete_past_state_values(self, current_time_slot: DateTime):
         """Delete data regarding energy production for past market slots."""
-        to_delete = []
-        for market_slot in self._available_energy_kWh:
-            if is_time_slot_in_past_markets(market_slot, current_time_slot):
-                to_delete.append(market_slot)
+        past_markets_threshold = get_past_markets_threshold(current_time_slot)
+        to_delete = [market_slot for market_slot in self._available_energy_kWh
+                     if market_slot < past_markets_threshold]
 
         for market_slot in to_delete:
             self._available_energy_kWh.pop(market_slot, None)
@@ -419,10 +417,9 @@ class SmartMeterState(ConsumptionState, ProductionState):
 
     def delete_past_state_values(self, current_time_slot: DateTime):
         """Delete data regarding energy requirements and availability for past market slots."""
-        to_delete = []
-        for market_slot in self.market_slots:
-            if is_time_slot_in_past_markets(market_slot, current_time_slot):
-                to_delete.append(market_slot)
+        past_markets_threshold = get_past_markets_threshold(current_time_slot)
+        to_delete = [market_slot for market_slot in self.market_slots
+                     if market_slot < past_markets_threshold]
 
         for market_slot in to_delete:
             self._available_energy_kWh.pop(market_slot, None)
@@ -723,10 +720,9 @@ class StorageState(StateInterface):
         Clean up values from past market slots that are not used anymore. Useful for
         deallocating memory that is not used anymore.
         """
-        to_delete = []
-        for market_slot in self.pledged_sell_kWh:
-            if is_time_slot_in_past_markets(market_slot, current_time_slot):
-                to_delete.append(market_slot)
+        past_markets_threshold = get_past_markets_threshold(current_time_slot)
+        to_delete = [market_slot for market_slot in self.pledged_sell_kWh
+                     if market_slot < past_markets_threshold]
         for market_slot in to_delete:
             self.pledged_sell_kWh.pop(market_slot, None)
             self.offered_sell_kWh.pop(market_slot, None)
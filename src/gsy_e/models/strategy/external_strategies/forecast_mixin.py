@@ -1,5 +1,6 @@
 import json
 import logging
+import re
 from collections import deque
 from typing import Dict
 
@@ -8,6 +9,11 @@ from pendulum import DateTime
 
 from gsy_e.models.strategy.external_strategies import IncomingRequest, ExternalMixin
 
+# Time stamps sent by the API clients start with an ISO 8601 date and time of day. Keys that
+# do not are rejected up front instead of going through the (much slower) failing pendulum
+# parse, keys that do are still fully parsed by pendulum.
+_TIME_STAMP_RE = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}")
+
 
 class ForecastExternalMixin(ExternalMixin):
 
@@ -162,10 +168,12 @@ class ForecastExternalMixin(ExternalMixin):
     def _set_device_energy_data_state(self, command_type: str, arguments: Dict) -> None:
         """Update the state of the device with forecast and measurement data."""
         if command_type == "set_energy_forecast":
+            self._validate_time_stamps_in_profile(arguments["energy_forecast"])
             self._validate_values_positive_in_profile(arguments["energy_forecast"])
             self.energy_forecast_buffer.update(
                 convert_str_to_pendulum_in_dict(arguments["energy_forecast"]))
         elif command_type == "set_energy_measurement":
+            self._validate_time_stamps_in_profile(arguments["energy_measurement"])
             self._validate_values_positive_in_profile(arguments["energy_measurement"])
             self.energy_measurement_buffer.update(
                 convert_str_to_pendulum_in_dict(arguments["energy_measurement"]))
@@ -173,6 +181,13 @@ class ForecastExternalMixin(ExternalMixin):
             assert False, f"Unsupported command {command_type}, available commands: " \
                           "set_energy_forecast, set_energy_measurement"
 
+    @staticmethod
+    def _validate_time_stamps_in_profile(profile: Dict) -> None:
+        """Validate whether all keys of a profile start with an ISO 8601 date and time."""
+        for time_str in profile:
+            if not _TIME_STAMP_RE.match(time_str):
+                raise ValueError(f"Wrong time stamp format {time_str}.")
+
     @staticmethod
     def _validate_values_positive_in_profile(profile: Dict) -> None:
         """Validate whether all values are positive in a profile."""
@@ -298,7 +298,9 @@ class LoadHoursStrategy(BidEnabledStrategy):
     @staticmethod
     def _find_acceptable_offer(market):
         offers = market.most_affordable_offers
-        return random.choice(offers)
+        # Index with a random integer instead of random.choice(offers), which converts the list
+        # of offers into an object array. Both draw the same number from the seeded generator.
+        return offers[random.randint(len(offers))]
 
     def _offer_rate_can_be_accepted(self, offer: Offer, market_slot: MarketBase):
         """Check if the offer rate is less than what the device wants to pay."""
@@ -375,7 +377,7 @@ class LoadHoursStrategy(BidEnabledStrategy):
         return self._is_market_active(market) and self.state.can_buy_more_energy(market.time_slot)
 
     def _offer_comes_from_different_seller(self, offer):
-        return offer.seller not in [self.owner.name, self.area.name]
+        return offer.seller not in (self.owner.name, self.area.name)
 
     def _set_alternative_pricing_scheme(self):
         if ConstSettings.MASettings.AlternativePricing.PRICING_SCHEME != 0:
@@ -27,6 +27,7 @@ BidInfo = namedtuple("BidInfo", ("source_bid", "target_bid"))
 
 class FutureEngine(TwoSidedEngine):
     """Handles order forwarding between future markets."""
+    __slots__ = ()
 
     def __repr__(self) -> str:
         return (f"<FutureEngine [{self.owner.name}] {self.name} "
@@ -37,7 +37,7 @@ class OneSidedAgent(MarketAgent):
 
     def usable_offer(self, offer):
         """Prevent MAEngines from trading their counterpart's offers"""
-        return all(offer.id not in engine.forwarded_offers.keys() for engine in self.engines)
+        return all(offer.id not in engine.forwarded_offers for engine in self.engines)
 
     def get_market_from_market_id(self, market_id: str) -> Optional[MarketBase]:
         """Return Market object from market_id."""
@@ -79,6 +79,7 @@ class OneSidedAgent(MarketAgent):
         for engine in self.engines:
             del engine.forwarded_offers
             del engine.offer_age
+            del engine._offer_age_heap  # pylint: disable=protected-access
             del engine.trade_residual
             del engine
 
@@ -15,8 +15,10 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
+import heapq
 from collections import namedtuple
-from typing import Dict, Optional  # noqa
+from logging import DEBUG
+from typing import Dict, List, Optional, Tuple  # noqa
 
 from gsy_framework.constants_limits import ConstSettings
 from gsy_framework.data_classes import Offer
@@ -34,6 +36,9 @@ ResidualInfo = namedtuple("ResidualInfo", ("forwarded", "age"))
 class MAEngine:
     """Handle forwarding offers to the connected one-sided market."""
     # pylint: disable = too-many-arguments
+    # Engines are created for every market slot of every market agent, avoid a __dict__ for each
+    __slots__ = ("name", "markets", "min_offer_age", "owner", "offer_age", "_offer_age_heap",
+                 "forwarded_offers", "trade_residual")
 
     def __init__(self, name: str, market_1, market_2, min_offer_age: int, owner):
         self.name = name
@@ -42,6 +47,9 @@ class MAEngine:
         self.owner = owner
 
         self.offer_age: Dict[str, int] = {}
+        # Min-heap of (offer age, Offer.id), used to only visit offers that are old enough to be
+        # forwarded. Entries that do not match offer_age any more are stale and get discarded.
+        self._offer_age_heap: List[Tuple[int, str]] = []
         # Offer.id -> OfferInfo
         self.forwarded_offers: Dict[str, OfferInfo] = {}
         self.trade_residual: Dict[str, Offer] = {}
@@ -83,7 +91,7 @@ class MAEngine:
             return None
 
         self._add_to_forward_offers(offer, forwarded_offer)
-        self.owner.log.trace(f"Forwarding offer {offer} to {forwarded_offer}")
+        self.owner.log.trace("Forwarding offer %s to %s", offer, forwarded_offer)
         # TODO: Ugly solution, required in order to decouple offer placement from
         # new offer event triggering
         self.markets.target.dispatch_market_offer_event(forwarded_offer)
@@ -93,8 +101,11 @@ class MAEngine:
         offer_info = self.forwarded_offers.pop(offer.id, None)
         if not offer_info:
             return
-        self.forwarded_offers.pop(offer_info.target_offer.id, None)
-        self.forwarded_offers.pop(offer_info.source_offer.id, None)
+        # offer.id is usually one side of the pair and has already been removed above
+        if offer.id != offer_info.target_offer.id:
+            self.forwarded_offers.pop(offer_info.target_offer.id, None)
+        if offer.id != offer_info.source_offer.id:
+            self.forwarded_offers.pop(offer_info.source_offer.id, None)
         self.offer_age.pop(offer_info.target_offer.id, None)
         self.offer_age.pop(offer_info.source_offer.id, None)
 
@@ -103,16 +114,20 @@ class MAEngine:
         self._propagate_offer(area.current_tick)
 
     def _propagate_offer(self, current_tick):
-        # Store age of offer
-        for offer in self.markets.source.offers.values():
-            if offer.id not in self.offer_age:
-                self.offer_age[offer.id] = current_tick
-
-        # Use `list()` to avoid in place modification errors
-        for offer_id, age in list(self.offer_age.items()):
-            if offer_id in self.forwarded_offers:
+        # Store age of offer, source market offers are keyed by their ids
+        for offer_id in self.markets.source.offers:
+            if offer_id not in self.offer_age:
+                self.offer_age[offer_id] = current_tick
+                heapq.heappush(self._offer_age_heap, (current_tick, offer_id))
+
+        not_forwarded = []
+        while (self._offer_age_heap and
+               current_tick - self._offer_age_heap[0][0] >= self.min_offer_age):
+            age, offer_id = heapq.heappop(self._offer_age_heap)
+            if self.offer_age.get(offer_id) != age:
+                # Stale entry, the offer age was removed or updated in the meantime
                 continue
-            if current_tick - age < self.min_offer_age:
+            if offer_id in self.forwarded_offers:
                 continue
             offer = self.markets.source.offers.get(offer_id)
             if not offer:
@@ -137,8 +152,15 @@ class MAEngine:
 
             forwarded_offer = self._forward_offer(offer)
             if forwarded_offer:
-                self.owner.log.debug(f"Forwarded offer to {self.markets.source.name} "
-                                     f"{self.owner.name}, {self.name} {forwarded_offer}")
+                self.owner.log.debug("Forwarded offer to %s %s, %s %s",
+                                     self.markets.source.name, self.owner.name, self.name,
+                                     forwarded_offer)
+            else:
+                # Retry forwarding on the next tick
+                not_forwarded.append((age, offer_id))
+
+        for entry in not_forwarded:
+            heapq.heappush(self._offer_age_heap, entry)
 
     def event_offer_traded(self, *, trade):
         """Perform actions that need to be done when OFFER_TRADED event is triggered."""
@@ -181,7 +203,7 @@ class MAEngine:
             except OfferNotFoundException as ex:
                 raise OfferNotFoundException() from ex
             self.owner.log.debug(
-                f"[{self.markets.source.time_slot_str}] Offer accepted {trade_source}")
+                "[%s] Offer accepted %s", self.markets.source.time_slot_str, trade_source)
 
             self._delete_forwarded_offer_entries(offer_info.source_offer)
             self.offer_age.pop(offer_info.source_offer.id, None)
@@ -271,11 +293,15 @@ class MAEngine:
             return
 
         if original_offer.id in self.offer_age:
-            self.offer_age[residual_offer.id] = self.offer_age.pop(original_offer.id)
+            age = self.offer_age.pop(original_offer.id)
+            self.offer_age[residual_offer.id] = age
+            heapq.heappush(self._offer_age_heap, (age, residual_offer.id))
 
-        self.owner.log.debug(f"Offer {short_offer_bid_log_str(local_offer)} was split into "
-                             f"{short_offer_bid_log_str(local_split_offer)} and "
-                             f"{short_offer_bid_log_str(local_residual_offer)}")
+        if self.owner.log.isEnabledFor(DEBUG):
+            self.owner.log.debug("Offer %s was split into %s and %s",
+                                 short_offer_bid_log_str(local_offer),
+                                 short_offer_bid_log_str(local_split_offer),
+                                 short_offer_bid_log_str(local_residual_offer))
 
     def _add_to_forward_offers(self, source_offer, target_offer):
         offer_info = OfferInfo(Offer.copy(source_offer), Offer.copy(target_offer))
@@ -285,6 +311,7 @@ class MAEngine:
 
 class BalancingEngine(MAEngine):
     """Handle forwarding offers to the connected balancing market."""
+    __slots__ = ()
 
     def _forward_offer(self, offer):
         forwarded_balancing_offer = self.markets.target.balancing_offer(
@@ -294,5 +321,6 @@ class BalancingEngine(MAEngine):
             from_agent=True
         )
         self._add_to_forward_offers(offer, forwarded_balancing_offer)
-        self.owner.log.trace(f"Forwarding balancing offer {offer} to {forwarded_balancing_offer}")
+        self.owner.log.trace("Forwarding balancing offer %s to %s",
+                             offer, forwarded_balancing_offer)
         return forwarded_balancing_offer
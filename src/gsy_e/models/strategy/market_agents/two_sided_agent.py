@@ -47,7 +47,7 @@ class TwoSidedAgent(OneSidedAgent):
 
     def usable_bid(self, bid):
         """Prevent MAEngines from trading their counterpart's bids."""
-        return all(bid.id not in engine.forwarded_bids.keys() for engine in self.engines)
+        return all(bid.id not in engine.forwarded_bids for engine in self.engines)
 
     # pylint: disable=unused-argument
     def event_bid_traded(self, *, market_id, bid_trade):
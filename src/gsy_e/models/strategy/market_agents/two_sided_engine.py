@@ -34,6 +34,7 @@ BidInfo = namedtuple("BidInfo", ("source_bid", "target_bid"))
 class TwoSidedEngine(MAEngine):
     """Handle forwarding offers and bids to the connected two-sided market."""
     # pylint: disable = too-many-arguments
+    __slots__ = ("forwarded_bids", "bid_trade_residual", "min_bid_age", "bid_age")
 
     def __init__(self, name: str, market_1, market_2, min_offer_age: int, min_bid_age: int,
                  owner: "MarketAgent"):
@@ -95,8 +96,11 @@ class TwoSidedEngine(MAEngine):
         bid_info = self.forwarded_bids.pop(bid.id, None)
         if not bid_info:
             return
-        self.forwarded_bids.pop(bid_info.target_bid.id, None)
-        self.forwarded_bids.pop(bid_info.source_bid.id, None)
+        # bid.id is usually one side of the pair and has already been removed above
+        if bid.id != bid_info.target_bid.id:
+            self.forwarded_bids.pop(bid_info.target_bid.id, None)
+        if bid.id != bid_info.source_bid.id:
+            self.forwarded_bids.pop(bid_info.source_bid.id, None)
         self.bid_age.pop(bid_info.source_bid.id, None)
         self.bid_age.pop(bid_info.target_bid.id, None)
 
@@ -12,15 +12,16 @@ General Public License for more details.
 You should have received a copy of the GNU General Public License along with this program. If not,
 see <http://www.gnu.org/licenses/>.
 """
+import os
 from logging import getLogger
 from pathlib import Path
-from typing import Dict, Union
+from typing import Callable, Dict, Union
 
 from gsy_framework.constants_limits import ConstSettings
 from gsy_framework.data_classes import Offer
 from gsy_framework.enums import SpotMarketTypeEnum
 from gsy_framework.read_user_profile import read_arbitrary_profile, InputProfileTypes
-from gsy_framework.utils import find_object_of_same_weekday_and_time, limit_float_precision
+from gsy_framework.utils import limit_float_precision
 from gsy_framework.validators.smart_meter_validator import SmartMeterValidator
 from numpy import random
 from pendulum import duration
@@ -55,6 +56,16 @@ class SmartMeterStrategy(BidEnabledStrategy):
         # Common parameters
         "fit_to_limit", "update_interval", "use_market_maker_rate")
 
+    # Map the rate parameters of the bid/offer updaters to the arguments that reconfigure them
+    _CONSUMPTION_RATE_KWARGS = {
+        "initial_rate": "initial_buying_rate",
+        "final_rate": "final_buying_rate",
+        "energy_rate_change_per_update": "energy_rate_increase_per_update"}
+    _PRODUCTION_RATE_KWARGS = {
+        "initial_rate": "initial_selling_rate",
+        "final_rate": "final_selling_rate",
+        "energy_rate_change_per_update": "energy_rate_decrease_per_update"}
+
     def __init__(
             self,
             smart_meter_profile: Union[Path, str, Dict[int, float], Dict[str, float]] = None,
@@ -96,6 +107,8 @@ class SmartMeterStrategy(BidEnabledStrategy):
 
         self.smart_meter_profile = smart_meter_profile  # Raw profile data
         self.profile = None  # Preprocessed data extracted from smart_meter_profile
+        # Identifies the raw profile that self.profile was preprocessed from
+        self._profile_input_key = None
         if should_read_profile_from_db(self.smart_meter_profile):
             self.smart_meter_profile = None
         self.profile_uuid = smart_meter_profile_uuid
@@ -118,6 +131,8 @@ class SmartMeterStrategy(BidEnabledStrategy):
 
         self._state = SmartMeterState()
         self._simulation_start_timestamp = None
+        # Markets of the current market slot, refreshed on each market cycle
+        self._markets_this_cycle = None
 
         # Instances to update the Smart Meter's bids and offers across all market slots
         self.bid_update = None
@@ -128,6 +143,13 @@ class SmartMeterStrategy(BidEnabledStrategy):
     def state(self) -> SmartMeterState:
         return self._state
 
+    @property
+    def _markets(self):
+        """Return the markets of the area, avoiding to rebuild the list on every access."""
+        if self._markets_this_cycle is None:
+            self._markets_this_cycle = self.area.all_markets
+        return self._markets_this_cycle
+
     def _init_price_update(self):
         """Initialize the bid and offer updaters."""
         self.bid_update = TemplateStrategyBidUpdater(
@@ -184,12 +206,19 @@ class SmartMeterStrategy(BidEnabledStrategy):
         self._set_energy_forecast_for_future_markets(reconfigure=True)
 
     def _read_or_rotate_profiles(self, reconfigure=False):
-        input_profile = self.smart_meter_profile \
-            if reconfigure or not self.profile else self.profile
+        input_key = _get_profile_input_key(self.smart_meter_profile)
+        if reconfigure and input_key is not None and input_key == self._profile_input_key:
+            # The raw profile has already been preprocessed, avoid parsing it again
+            reconfigure = False
+
+        read_raw_profile = reconfigure or not self.profile
+        input_profile = self.smart_meter_profile if read_raw_profile else self.profile
         self.profile = \
             global_objects.profiles_handler.rotate_profile(profile_type=InputProfileTypes.POWER,
                                                            profile=input_profile,
                                                            profile_uuid=self.profile_uuid)
+        if read_raw_profile:
+            self._profile_input_key = input_key
 
     def event_market_cycle(self):
         """Prepare rates and execute bids/offers when a new market slot begins.
@@ -197,15 +226,18 @@ class SmartMeterStrategy(BidEnabledStrategy):
         This method is triggered by the MARKET_CYCLE event.
         """
         super().event_market_cycle()
+        # The area has rotated its markets, the cached list is outdated
+        self._markets_this_cycle = None
 
         self._reset_rates_and_update_prices()
         self._set_energy_forecast_for_future_markets(reconfigure=False)
         self._set_energy_measurement_of_last_market()
+        # Only make bids in two-sided markets
+        post_bids = ConstSettings.MASettings.MARKET_TYPE != 1
         # Create bids/offers for the expected energy consumption/production in future markets
-        for market in self.area.all_markets:
+        for market in self._markets:
             self._post_offer(market)
-            # Only make bids in two-sided markets
-            if ConstSettings.MASettings.MARKET_TYPE != 1:
+            if post_bids:
                 self._post_first_bid(market)
 
         self._delete_past_state()
@@ -249,16 +281,17 @@ class SmartMeterStrategy(BidEnabledStrategy):
 
         This method is triggered by the MarketEvent.OFFER_TRADED event.
         """
+        owner_name = self.owner.name
+        if owner_name not in (trade.seller, trade.buyer):
+            return  # Only react to trades in which the device took part
+
         market = self.area.get_spot_or_future_market_by_id(market_id)
         if not market:
             return
 
-        if self.owner.name not in (trade.seller, trade.buyer):
-            return  # Only react to trades in which the device took part
-
         super().event_offer_traded(market_id=market_id, trade=trade)
 
-        is_buyer = self.owner.name == trade.buyer
+        is_buyer = owner_name == trade.buyer
         if is_buyer:
             self.assert_if_trade_bid_price_is_too_high(market, trade)
             if ConstSettings.BalancingSettings.FLEXIBLE_LOADS_SUPPORT:
@@ -269,7 +302,7 @@ class SmartMeterStrategy(BidEnabledStrategy):
         else:
             self._assert_if_trade_offer_price_is_too_low(market_id, trade)
             self.state.decrement_available_energy(
-                trade.traded_energy, market.time_slot, self.owner.name)
+                trade.traded_energy, market.time_slot, owner_name)
 
     def event_bid_traded(self, *, market_id, bid_trade):
         """Register the bid traded by the device. Extends the superclass method.
@@ -305,79 +338,38 @@ class SmartMeterStrategy(BidEnabledStrategy):
             self._set_energy_forecast_for_future_markets(reconfigure=True)
 
     def _area_reconfigure_production_prices(self, **kwargs):
-        if kwargs.get("initial_selling_rate") is not None:
-            initial_rate = read_arbitrary_profile(
-                InputProfileTypes.IDENTITY, kwargs["initial_selling_rate"])
-        else:
-            initial_rate = self.offer_update.initial_rate_profile_buffer
-
-        if kwargs.get("final_selling_rate") is not None:
-            final_rate = read_arbitrary_profile(
-                InputProfileTypes.IDENTITY, kwargs["final_selling_rate"])
-        else:
-            final_rate = self.offer_update.final_rate_profile_buffer
-
-        if kwargs.get("energy_rate_decrease_per_update") is not None:
-            energy_rate_change_per_update = read_arbitrary_profile(
-                InputProfileTypes.IDENTITY, kwargs["energy_rate_decrease_per_update"])
-        else:
-            energy_rate_change_per_update = (
-                self.offer_update.energy_rate_change_per_update_profile_buffer)
-
-        if kwargs.get("fit_to_limit") is not None:
-            fit_to_limit = kwargs["fit_to_limit"]
-        else:
-            fit_to_limit = self.offer_update.fit_to_limit
-
-        if kwargs.get("update_interval") is not None:
-            if isinstance(kwargs["update_interval"], int):
-                update_interval = duration(minutes=kwargs["update_interval"])
-            else:
-                update_interval = kwargs["update_interval"]
-        else:
-            update_interval = self.offer_update.update_interval
-
-        if kwargs.get("use_market_maker_rate") is not None:
-            self.use_market_maker_rate = kwargs["use_market_maker_rate"]
-
-        try:
-            self._validate_production_rates(
-                initial_rate, final_rate, energy_rate_change_per_update, fit_to_limit)
-        except Exception as ex:
-            log.exception("SmartMeterStrategy._area_reconfigure_production_prices failed: %s", ex)
-            return
-
-        self.offer_update.set_parameters(
-            initial_rate=initial_rate,
-            final_rate=final_rate,
-            energy_rate_change_per_update=energy_rate_change_per_update,
-            fit_to_limit=fit_to_limit,
-            update_interval=update_interval)
+        self._area_reconfigure_prices(
+            self.offer_update, self._PRODUCTION_RATE_KWARGS, self._validate_production_rates,
+            **kwargs)
 
     def _area_reconfigure_consumption_prices(self, **kwargs):
-        if kwargs.get("initial_buying_rate") is not None:
-            initial_rate = read_arbitrary_profile(
-                InputProfileTypes.IDENTITY, kwargs["initial_buying_rate"])
-        else:
-            initial_rate = self.bid_update.initial_rate_profile_buffer
+        self._area_reconfigure_prices(
+            self.bid_update, self._CONSUMPTION_RATE_KWARGS, self._validate_consumption_rates,
+            **kwargs)
 
-        if kwargs.get("final_buying_rate") is not None:
-            final_rate = read_arbitrary_profile(
-                InputProfileTypes.IDENTITY, kwargs["final_buying_rate"])
-        else:
-            final_rate = self.bid_update.final_rate_profile_buffer
+    def _area_reconfigure_prices(
+            self, updater: Union[TemplateStrategyBidUpdater, TemplateStrategyOfferUpdater],
+            rate_kwargs: Dict[str, str], validate_rates: Callable, **kwargs):
+        """Reconfigure the rates of the updater using the provided arguments.
 
-        if kwargs.get("energy_rate_increase_per_update") is not None:
-            energy_rate_change_per_update = read_arbitrary_profile(
-                InputProfileTypes.IDENTITY, kwargs["energy_rate_increase_per_update"])
-        else:
-            energy_rate_change_per_update = (
-                self.bid_update.energy_rate_change_per_update_profile_buffer)
+        Args:
+            updater: the bid or offer updater whose parameters are reconfigured.
+            rate_kwargs: maps the rate parameters of the updater to the names of the arguments
+                that reconfigure them.
+            validate_rates: method used to validate the rates before applying them.
+        """
+        rates = {}
+        for rate_name, kwarg_name in rate_kwargs.items():
+            if kwargs.get(kwarg_name) is not None:
+                rates[rate_name] = read_arbitrary_profile(
+                    InputProfileTypes.IDENTITY, kwargs[kwarg_name])
+            else:
+                rates[rate_name] = getattr(updater, f"{rate_name}_profile_buffer")
 
         if kwargs.get("fit_to_limit") is not None:
             fit_to_limit = kwargs["fit_to_limit"]
         else:
-            fit_to_limit = self.bid_update.fit_to_limit
+            fit_to_limit = updater.fit_to_limit
 
         if kwargs.get("update_interval") is not None:
             if isinstance(kwargs["update_interval"], int):
@@ -385,24 +377,19 @@ class SmartMeterStrategy(BidEnabledStrategy):
             else:
                 update_interval = kwargs["update_interval"]
         else:
-            update_interval = self.bid_update.update_interval
+            update_interval = updater.update_interval
 
         if kwargs.get("use_market_maker_rate") is not None:
             self.use_market_maker_rate = kwargs["use_market_maker_rate"]
 
         try:
-            self._validate_consumption_rates(
-                initial_rate, final_rate, energy_rate_change_per_update, fit_to_limit)
+            validate_rates(**rates, fit_to_limit=fit_to_limit)
         except Exception as ex:
-            log.exception(ex)
+            log.exception("SmartMeterStrategy._area_reconfigure_prices failed: %s", ex)
             return
 
-        self.bid_update.set_parameters(
-            initial_rate=initial_rate,
-            final_rate=final_rate,
-            energy_rate_change_per_update=energy_rate_change_per_update,
-            fit_to_limit=fit_to_limit,
-            update_interval=update_interval)
+        updater.set_parameters(
+            **rates, fit_to_limit=fit_to_limit, update_interval=update_interval)
 
     def _reset_rates_and_update_prices(self):
         """Set the initial/final rates and update the price of all bids/offers consequently."""
@@ -418,15 +405,16 @@ class SmartMeterStrategy(BidEnabledStrategy):
         offer_energy_kWh -= self.offers.open_offer_energy(market.id)
         if offer_energy_kWh > 0:
             offer_price = self.offer_update.initial_rate[market.time_slot] * offer_energy_kWh
+            owner = self.owner
             try:
                 offer = market.offer(
                     offer_price,
                     offer_energy_kWh,
-                    self.owner.name,
+                    owner.name,
                     original_price=offer_price,
-                    seller_origin=self.owner.name,
-                    seller_origin_id=self.owner.uuid,
-                    seller_id=self.owner.uuid)
+                    seller_origin=owner.name,
+                    seller_origin_id=owner.uuid,
+                    seller_id=owner.uuid)
                 self.offers.post(offer, market.id)
             except MarketException:
                 pass
@@ -460,14 +448,15 @@ class SmartMeterStrategy(BidEnabledStrategy):
                 f"Smart Meter {self.owner.name} tries to set its required energy forecast without "
                 "a profile.")
 
-        for market in self.area.all_markets:
+        profile = self.profile
+        for market in self._markets:
             slot_time = market.time_slot
-            energy_kWh = find_object_of_same_weekday_and_time(self.profile, slot_time)
+            energy_kWh = utils.get_profile_value_at_time_slot(profile, slot_time)
             # For the Smart Meter, the energy amount can be either positive (consumption) or
             # negative (production).
-            consumed_energy = energy_kWh if energy_kWh > 0 else 0.0
+            consumed_energy = max(energy_kWh, 0.0)
             # Turn energy into a positive number (required for set_available_energy method)
-            produced_energy = abs(energy_kWh) if energy_kWh < 0 else 0.0
+            produced_energy = max(-energy_kWh, 0.0)
 
             if consumed_energy and produced_energy:
                 raise InconsistentEnergyException(
@@ -501,40 +490,52 @@ class SmartMeterStrategy(BidEnabledStrategy):
         self.offer_update.delete_past_state_values(self.area.current_market.time_slot)
 
     def _replace_rates_with_market_maker_rates(self):
+        market_maker_rate = get_market_maker_rate_from_config(self.area.spot_market, 0)
+        path_to_root_fees = self.owner.get_path_to_root_fees()
+
         # Reconfigure the final buying rate (for energy consumption)
         self._area_reconfigure_consumption_prices(
-            final_buying_rate=get_market_maker_rate_from_config(
-                self.area.spot_market, 0) + self.owner.get_path_to_root_fees(), validate=False)
+            final_buying_rate=market_maker_rate + path_to_root_fees, validate=False)
 
         # Reconfigure the initial selling rate (for energy production)
         self._area_reconfigure_production_prices(
-            initial_selling_rate=get_market_maker_rate_from_config(
-                self.area.spot_market, 0) - self.owner.get_path_to_root_fees(), validate=False)
+            initial_selling_rate=market_maker_rate - path_to_root_fees, validate=False)
 
     def _validate_consumption_rates(
             self, initial_rate, final_rate, energy_rate_change_per_update, fit_to_limit):
-        for time_slot in initial_rate.keys():
-            rate_change = None if fit_to_limit else find_object_of_same_weekday_and_time(
-                energy_rate_change_per_update, time_slot)
-
+        for initial, final, rate_change in self._get_distinct_rates(
+                initial_rate, final_rate, energy_rate_change_per_update, fit_to_limit):
             self.validator.validate_rate(
-                initial_buying_rate=initial_rate[time_slot],
+                initial_buying_rate=initial,
                 energy_rate_increase_per_update=rate_change,
-                final_buying_rate=find_object_of_same_weekday_and_time(final_rate, time_slot),
+                final_buying_rate=final,
                 fit_to_limit=fit_to_limit)
 
     def _validate_production_rates(
             self, initial_rate, final_rate, energy_rate_change_per_update, fit_to_limit):
-        for time_slot in initial_rate.keys():
-            rate_change = None if fit_to_limit else find_object_of_same_weekday_and_time(
-                energy_rate_change_per_update, time_slot)
-
+        for initial, final, rate_change in self._get_distinct_rates(
+                initial_rate, final_rate, energy_rate_change_per_update, fit_to_limit):
             self.validator.validate_rate(
-                initial_selling_rate=initial_rate[time_slot],
-                final_selling_rate=find_object_of_same_weekday_and_time(final_rate, time_slot),
+                initial_selling_rate=initial,
+                final_selling_rate=final,
                 energy_rate_decrease_per_update=rate_change,
                 fit_to_limit=fit_to_limit)
 
+    @staticmethod
+    def _get_distinct_rates(initial_rate, final_rate, energy_rate_change_per_update,
+                            fit_to_limit):
+        """Return the distinct (initial, final, rate change) combinations of the rate profiles.
+
+        Rate profiles are usually constant or repeat daily, so each combination only needs to be
+        validated once instead of once per time slot. The order of the time slots is kept.
+        """
+        return dict.fromkeys(
+            (initial_rate[time_slot],
+             utils.get_profile_value_at_time_slot(final_rate, time_slot),
+             None if fit_to_limit else utils.get_profile_value_at_time_slot(
+                 energy_rate_change_per_update, time_slot))
+            for time_slot in initial_rate)
+
     def _offer_rate_can_be_accepted(self, offer: Offer, market_slot: MarketBase):
         """Check if the offer rate is less than what the device wants to pay."""
         max_affordable_offer_rate = self.bid_update.get_updated_rate(market_slot.time_slot)
@@ -543,12 +544,14 @@ class SmartMeterStrategy(BidEnabledStrategy):
             <= max_affordable_offer_rate + FLOATING_POINT_TOLERANCE)
 
     def _event_tick_consumption(self):
-        for market in self.area.all_markets:
-            # One-sided market (only offers are posted)
-            if ConstSettings.MASettings.MARKET_TYPE == SpotMarketTypeEnum.ONE_SIDED.value:
+        market_type = ConstSettings.MASettings.MARKET_TYPE
+        # One-sided market (only offers are posted)
+        if market_type == SpotMarketTypeEnum.ONE_SIDED.value:
+            for market in self._markets:
                 self._one_sided_market_event_tick(market)
-            # Two-sided markets (both offers and bids are posted)
-            elif ConstSettings.MASettings.MARKET_TYPE == SpotMarketTypeEnum.TWO_SIDED.value:
+        # Two-sided markets (both offers and bids are posted)
+        elif market_type == SpotMarketTypeEnum.TWO_SIDED.value:
+            for market in self._markets:
                 # Update the price of existing bids to reflect the new rates
                 self.bid_update.update(market, self)
 
@@ -556,7 +559,7 @@ class SmartMeterStrategy(BidEnabledStrategy):
         self.bid_update.increment_update_counter_all_markets(self)
 
     def _event_tick_production(self):
-        for market in self.area.all_markets:
+        for market in self._markets:
             self.offer_update.update(market, self)
         self.offer_update.increment_update_counter_all_markets(self)
 
@@ -578,31 +581,57 @@ class SmartMeterStrategy(BidEnabledStrategy):
                 # If the device can still buy more energy
                 energy_Wh = self.state.calculate_energy_to_accept(
                     acceptable_offer.energy * 1000.0, time_slot)
+                owner = self.owner
                 self.accept_offer(market, acceptable_offer, energy=energy_Wh / 1000.0,
-                                  buyer_origin=self.owner.name,
-                                  buyer_origin_id=self.owner.uuid,
-                                  buyer_id=self.owner.uuid)
-                self.state.decrement_energy_requirement(energy_Wh, time_slot, self.owner.name)
+                                  buyer_origin=owner.name,
+                                  buyer_origin_id=owner.uuid,
+                                  buyer_id=owner.uuid)
+                self.state.decrement_energy_requirement(energy_Wh, time_slot, owner.name)
 
         except MarketException:
-            self.log.exception("An Error occurred while buying an offer.")
+            # Offers can be accepted or deleted by other devices in the meantime, which is part
+            # of the normal market flow and does not deserve an error with traceback.
+            self.log.debug("An Error occurred while buying an offer.", exc_info=True)
 
     @staticmethod
     def _find_acceptable_offer(market):
         offers = market.most_affordable_offers
-        return random.choice(offers)
+        # Index with a random integer instead of random.choice(offers), which converts the list
+        # of offers into an object array. Both draw the same number from the seeded generator.
+        return offers[random.randint(len(offers))]
 
     def event_balancing_market_cycle(self):
         # TODO: implement
         pass
 
     def _offer_comes_from_different_seller(self, offer):
-        return offer.seller != self.owner.name and offer.seller != self.area.name
+        # Containment compares by identity before equality, so the device's own offers (which
+        # share the owner's name object) are rejected without a string comparison.
+        return offer.seller not in (self.owner.name, self.area.name)
 
     @property
     def asset_type(self):
         return AssetType.PRODUCER
 
 
+def _get_profile_input_key(profile) -> Union[tuple, str, float, None]:
+    """Return a key that changes whenever the content of the raw profile input changes.
+
+    File paths are identified by their modification time and size, dicts by their items.
+    Return None if the input can not be identified (e.g. profiles that are read from the DB).
+    """
+    if isinstance(profile, (str, Path)):
+        try:
+            stat = os.stat(profile)
+        except (OSError, ValueError):
+            return str(profile)
+        return str(profile), stat.st_mtime_ns, stat.st_size
+    if isinstance(profile, dict):
+        return tuple(profile.items())
+    if isinstance(profile, (int, float)):
+        return profile
+    return None
+
+
 class InconsistentEnergyException(Exception):
     """Exception raised when the energy produced/consumed by the Smart Meter doesn't make sense."""
@@ -26,7 +26,7 @@ from pendulum import duration, DateTime, Duration
 
 import gsy_e.constants
 from gsy_e.gsy_e_core.global_objects_singleton import global_objects
-from gsy_e.gsy_e_core.util import write_default_to_dict, is_time_slot_in_past_markets
+from gsy_e.gsy_e_core.util import write_default_to_dict, get_past_markets_threshold
 
 if TYPE_CHECKING:
     from gsy_e.models.area import Area
@@ -106,10 +106,9 @@ class TemplateStrategyUpdaterBase(TemplateStrategyUpdaterInterface):
 
     def delete_past_state_values(self, current_market_time_slot: DateTime) -> None:
         """Delete values from buffers before the current_market_time_slot"""
-        to_delete = []
-        for market_slot in self.initial_rate:
-            if is_time_slot_in_past_markets(market_slot, current_market_time_slot):
-                to_delete.append(market_slot)
+        past_markets_threshold = get_past_markets_threshold(current_market_time_slot)
+        to_delete = [market_slot for market_slot in self.initial_rate
+                     if market_slot < past_markets_threshold]
         for market_slot in to_delete:
             self.initial_rate.pop(market_slot, None)
             self.final_rate.pop(market_slot, None)
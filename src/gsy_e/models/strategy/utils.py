@@ -14,9 +14,11 @@ You should have received a copy of the GNU General Public License along with thi
 see <http://www.gnu.org/licenses/>.
 """
 import random
+from typing import Dict, Optional
 
-from gsy_framework.constants_limits import ConstSettings
-from gsy_framework.utils import limit_float_precision
+from gsy_framework.constants_limits import ConstSettings, GlobalConfig
+from gsy_framework.utils import find_object_of_same_weekday_and_time, limit_float_precision
+from pendulum import DateTime
 
 
 def compute_altered_energy(
@@ -41,3 +43,20 @@ def compute_altered_energy(
         return 0
 
     return limit_float_precision(altered_energy_kWh)
+
+
+def get_profile_value_at_time_slot(profile: Dict[DateTime, float],
+                                   time_slot: DateTime) -> Optional[float]:
+    """
+    Return the profile value for the time slot.
+
+    Profiles are usually keyed by the exact market time slots, therefore a direct dict lookup
+    is attempted first. Only if it misses, fall back to the weekday/time search of
+    find_object_of_same_weekday_and_time. On the Canary Network profile values are always
+    matched by weekday and time of day, even if the profile contains the exact time slot.
+    """
+    if not GlobalConfig.IS_CANARY_NETWORK:
+        value = profile.get(time_slot)
+        if value is not None:
+            return value
+    return find_object_of_same_weekday_and_time(profile, time_slot)
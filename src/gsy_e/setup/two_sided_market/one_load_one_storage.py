@@ -20,6 +20,8 @@ from gsy_e.models.strategy.storage import StorageStrategy
 from gsy_e.models.strategy.load_hours import LoadHoursStrategy
 from gsy_framework.constants_limits import ConstSettings
 
+LOAD_HRS_OF_DAY = tuple(range(8, 18))
+
 
 def get_setup(config):
     # Two sided market
@@ -44,7 +46,7 @@ def get_setup(config):
                     Area("H2 General Load", strategy=LoadHoursStrategy(
                         avg_power_W=100,
                         hrs_per_day=10,
-                        hrs_of_day=list(range(8, 18)),
+                        hrs_of_day=list(LOAD_HRS_OF_DAY),
                         initial_buying_rate=ConstSettings.LoadSettings.INITIAL_BUYING_RATE,
                         final_buying_rate=ConstSettings.LoadSettings.FINAL_BUYING_RATE
                     ))
@@ -17,7 +17,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from typing import Dict, Union
-from unittest.mock import MagicMock, Mock, call
+from unittest.mock import MagicMock, Mock, call, patch
 
 import pytest
 from gsy_framework.constants_limits import ConstSettings, GlobalConfig
@@ -45,9 +45,13 @@ from gsy_e.models.strategy.market_agents.two_sided_agent import TwoSidedAgent
 
 # pylint: disable=W0212
 
-@pytest.fixture(name="area_with_markets")
-def area_with_markets_fixture():
-    """Return Area activated object that contains all types of markets."""
+def _expected_broadcast_calls(event_type: AreaEvent, kwargs: Dict) -> tuple:
+    """Return the calls the dispatcher makes to broadcast an area event to all market types."""
+    return tuple(call(market_type, event_type, **kwargs)
+                 for market_type in AreaDispatcher._AREA_EVENT_MARKET_TYPES)
+
+
+def _create_area_with_markets() -> Area:
     config = Mock()
     config.slot_length = duration(minutes=15)
     config.tick_length = duration(seconds=15)
@@ -68,28 +72,35 @@ def area_with_markets_fixture():
     return area
 
 
+@pytest.fixture(name="area_with_markets")
+def area_with_markets_fixture():
+    """Return Area activated object that contains all types of markets."""
+    return _create_area_with_markets()
+
+
 @pytest.fixture(name="area_dispatcher")
 def area_dispatcher_fixture(area_with_markets):
     """Return fixture for AreaDispatcher object."""
     return AreaDispatcher(area_with_markets)
 
 
+@pytest.fixture(name="shared_area_dispatcher", scope="module")
+def shared_area_dispatcher_fixture():
+    """Return AreaDispatcher object whose area is shared by the tests that do not modify it."""
+    return AreaDispatcher(_create_area_with_markets())
+
+
+_MARKET_ID_GETTERS = {
+    AvailableMarketTypes.SPOT: lambda area: area.spot_market.id,
+    AvailableMarketTypes.FUTURE: lambda area: area.future_markets.id,
+    AvailableMarketTypes.SETTLEMENT: lambda area: list(area.settlement_markets.values())[0].id,
+    AvailableMarketTypes.BALANCING: lambda area: area.balancing_markets[0].id,
+}
+
+
 class TestAreaDispatcher:
     """Collection of tests for AreaDispatcher."""
 
-    @staticmethod
-    def _get_agents_for_market_type(
-            dispatcher_object, market_type: AvailableMarketTypes
-    ) -> Dict[DateTime, Union[OneSidedAgent, BalancingAgent, SettlementAgent]]:
-        """Select the correct agent dict in the AreaDispatcher depending on the market_type"""
-        if market_type == AvailableMarketTypes.SPOT:
-            return dispatcher_object.spot_agents
-        if market_type == AvailableMarketTypes.BALANCING:
-            return dispatcher_object.balancing_agents
-        if market_type == AvailableMarketTypes.SETTLEMENT:
-            return dispatcher_object.settlement_agents
-        assert False, f"Market type not supported {market_type}"
-
     @staticmethod
     def _create_ma_and_markets_for_time_slot(dispatcher_object: AreaDispatcher,
                                              time_slot: DateTime,
@@ -125,17 +136,15 @@ class TestAreaDispatcher:
             expected_agent_type: MarketAgent,
             area_dispatcher):
         """Test if create_market_agents creates correct objects in the agent dicts."""
-        original_matching_type = ConstSettings.MASettings.MARKET_TYPE
-        ConstSettings.MASettings.MARKET_TYPE = spot_market_type
-
         lower_market = MagicMock(autospec=market_class)
         higher_market = MagicMock(autospec=market_class)
         area_dispatcher.area.parent.get_market_instances_from_class_type = Mock(
             return_value={lower_market.time_slot: higher_market})
 
-        area_dispatcher.create_market_agents(market_type, lower_market)
+        with patch.object(ConstSettings.MASettings, "MARKET_TYPE", spot_market_type):
+            area_dispatcher.create_market_agents(market_type, lower_market)
 
-        agent_dict = self._get_agents_for_market_type(area_dispatcher, market_type)
+        agent_dict = AreaDispatcher._get_agents_for_market_type(area_dispatcher, market_type)
 
         assert lower_market.time_slot in agent_dict
         agent = agent_dict[lower_market.time_slot]
@@ -143,8 +152,6 @@ class TestAreaDispatcher:
         assert agent.higher_market == higher_market
         assert agent.lower_market == lower_market
 
-        ConstSettings.MASettings.MARKET_TYPE = original_matching_type
-
     @staticmethod
     def test_create_market_agents_for_future_markets(area_dispatcher):
         """Test if the future agent is correctly created."""
@@ -171,7 +178,7 @@ class TestAreaDispatcher:
         self._create_ma_and_markets_for_time_slot(area_dispatcher, second_time_slot,
                                                   market_class, market_type)
 
-        agent_dict = self._get_agents_for_market_type(area_dispatcher, market_type)
+        agent_dict = AreaDispatcher._get_agents_for_market_type(area_dispatcher, market_type)
         assert first_time_slot in agent_dict
         assert second_time_slot in agent_dict
 
@@ -189,8 +196,9 @@ class TestAreaDispatcher:
         AreaEvent.BALANCING_MARKET_CYCLE,
     ])
     def test_broadcast_notification_triggers_correct_methods_area_events(
-            event_type: Union[AreaEvent, MarketEvent], area_dispatcher):
+            event_type: Union[AreaEvent, MarketEvent], shared_area_dispatcher):
         """Test if broadcast_notification triggers correct dispatcher methods for area events."""
+        area_dispatcher = shared_area_dispatcher
         kwargs = {"market_id": area_dispatcher.area.spot_market.id}
         for child in area_dispatcher.area.children:
             child.dispatcher.event_listener = Mock()
@@ -201,12 +209,12 @@ class TestAreaDispatcher:
         for child in area_dispatcher.area.children:
             child.dispatcher.event_listener.assert_called_once()
 
-        (area_dispatcher._broadcast_notification_to_area_and_child_agents.
-            assert_has_calls([
-                call(AvailableMarketTypes.SPOT, event_type, **kwargs),
-                call(AvailableMarketTypes.BALANCING, event_type, **kwargs),
-                call(AvailableMarketTypes.SETTLEMENT, event_type, **kwargs),
-                call(AvailableMarketTypes.FUTURE, event_type, **kwargs)]))
+        # The expected calls are built from this tuple, pin its contents and order
+        assert AreaDispatcher._AREA_EVENT_MARKET_TYPES == (
+            AvailableMarketTypes.SPOT, AvailableMarketTypes.BALANCING,
+            AvailableMarketTypes.SETTLEMENT, AvailableMarketTypes.FUTURE)
+        area_dispatcher._broadcast_notification_to_area_and_child_agents.assert_has_calls(
+            _expected_broadcast_calls(event_type, kwargs))
 
     @staticmethod
     @pytest.mark.parametrize("event_type, expected_market_type", [
@@ -222,20 +230,10 @@ class TestAreaDispatcher:
     def test_broadcast_notification_triggers_correct_methods_market_events(
             event_type: Union[AreaEvent, MarketEvent],
             expected_market_type: AvailableMarketTypes,
-            area_dispatcher):
+            shared_area_dispatcher):
         """Test if broadcast_notification triggers correct dispatcher methods for market events."""
-
-        market_id = None
-        if expected_market_type == AvailableMarketTypes.SPOT:
-            market_id = area_dispatcher.area.spot_market.id
-        if expected_market_type == AvailableMarketTypes.FUTURE:
-            market_id = area_dispatcher.area.future_markets.id
-        if expected_market_type == AvailableMarketTypes.SETTLEMENT:
-            market_id = list(area_dispatcher.area.settlement_markets.values())[0].id
-        if expected_market_type == AvailableMarketTypes.BALANCING:
-            market_id = area_dispatcher.area.balancing_markets[0].id
-
-        kwargs = {"market_id": market_id}
+        area_dispatcher = shared_area_dispatcher
+        kwargs = {"market_id": _MARKET_ID_GETTERS[expected_market_type](area_dispatcher.area)}
 
         for child in area_dispatcher.area.children:
             child.dispatcher.event_listener = Mock()
@@ -15,8 +15,9 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
+import os
 import string
-from copy import deepcopy
+from copy import copy
 from unittest.mock import MagicMock
 from uuid import uuid4
 
@@ -24,7 +25,7 @@ import pytest
 from gsy_framework.constants_limits import ConstSettings
 from gsy_framework.data_classes import Bid, Offer
 from gsy_framework.utils import datetime_to_string_incl_seconds
-from hypothesis import strategies as st
+from hypothesis import Phase, settings, strategies as st
 from hypothesis.control import assume
 from hypothesis.stateful import Bundle, RuleBasedStateMachine, precondition, rule
 from pendulum import now
@@ -48,13 +49,36 @@ device_registry_dict = {
     "seller": {"balancing rates": (33, 35)},
 }
 
+MARKET_VARIANTS = [
+    (OneSidedMarket, "offer", "accept_offer"),
+    (BalancingMarket, "balancing_offer", "accept_offer"),
+    (SettlementMarket, "offer", "accept_offer"),
+]
+MARKET_VARIANT_IDS = ["onesided", "balancing", "settlement"]
+_EVENT_REPRS = {event: repr(event) for event in MarketEvent}
+_ACTOR_ALPHABET = string.ascii_letters + string.digits
+_ACTOR_STRATEGY = st.text(min_size=1, max_size=3, alphabet=_ACTOR_ALPHABET)
+# None of the tests assert on blockchain interface calls, so one mock is shared.
+_BC_MOCK = MagicMock()
 
-@pytest.fixture(scope="function", autouse=True)
+
+@pytest.fixture(scope="module", autouse=True)
 def device_registry_auto_fixture():
+    original_registry = DeviceRegistry.REGISTRY
+    original_market_type = ConstSettings.MASettings.MARKET_TYPE
     DeviceRegistry.REGISTRY = device_registry_dict
     ConstSettings.MASettings.MARKET_TYPE = 1
     yield
-    DeviceRegistry.REGISTRY = {}
+    DeviceRegistry.REGISTRY = original_registry
+    ConstSettings.MASettings.MARKET_TYPE = original_market_type
+
+
+@pytest.fixture(name="enable_balancing_market")
+def enable_balancing_market_fixture():
+    original_enable_balancing = ConstSettings.BalancingSettings.ENABLE_BALANCING_MARKET
+    ConstSettings.BalancingSettings.ENABLE_BALANCING_MARKET = True
+    yield
+    ConstSettings.BalancingSettings.ENABLE_BALANCING_MARKET = original_enable_balancing
 
 
 @pytest.fixture
@@ -62,18 +86,40 @@ def market():
     return TwoSidedMarket(time_slot=now())
 
 
-def test_device_registry(market=BalancingMarket()):
+@pytest.fixture(name="fake_bc", scope="session")
+def fake_bc_fixture():
+    """NonBlockchainInterface keeps no state besides its ids, so one instance can be shared."""
+    return NonBlockchainInterface(str(uuid4()))
+
+
+@pytest.fixture(name="make_market")
+def make_market_fixture(fake_bc):
+    """Return a factory that creates markets inside the test instead of at collection time."""
+    def _make_market(market_cls, bc=None, time_slot=None, **kwargs):
+        return market_cls(bc=bc or fake_bc, time_slot=time_slot or now(), **kwargs)
+    return _make_market
+
+
+@pytest.fixture(name="market_and_offer",
+                params=[(OneSidedMarket, "offer"),
+                        (BalancingMarket, "balancing_offer"),
+                        (SettlementMarket, "offer")],
+                ids=MARKET_VARIANT_IDS)
+def market_and_offer_fixture(request, make_market):
+    """Return a fresh market of each one-sided variant and the name of its offer method."""
+    market_cls, offer = request.param
+    return make_market(market_cls), offer
+
+
+def test_device_registry():
+    market = BalancingMarket()
     with pytest.raises(DeviceNotInRegistryError):
         market.balancing_offer(10, 10, "noone")
 
 
-@pytest.mark.parametrize("market, offer", [
-    (OneSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()), "offer"),
-    (BalancingMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()), "balancing_offer"),
-    (SettlementMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()), "offer"),
-])
-def test_market_offer(market, offer):
-    ConstSettings.BalancingSettings.ENABLE_BALANCING_MARKET = True
+@pytest.mark.usefixtures("enable_balancing_market")
+def test_market_offer(market_and_offer):
+    market, offer = market_and_offer
     e_offer = getattr(market, offer)(10, 20, "someone", "someone")
     assert market.offers[e_offer.id] == e_offer
     assert e_offer.energy == 20
@@ -84,12 +130,10 @@ def test_market_offer(market, offer):
     assert e_offer.time_slot == market.time_slot
 
 
-@pytest.mark.parametrize("market", [
-    TwoSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()),
-    SettlementMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now())
-])
-def test_market_bid(market):
-    ConstSettings.BalancingSettings.ENABLE_BALANCING_MARKET = True
+@pytest.mark.parametrize("market_cls", [TwoSidedMarket, SettlementMarket])
+@pytest.mark.usefixtures("enable_balancing_market")
+def test_market_bid(market_cls, make_market):
+    market = make_market(market_cls)
     bid = market.bid(10, 20, "someone", "someone")
     assert market.bids[bid.id] == bid
     assert bid.energy == 20
@@ -105,46 +149,37 @@ def test_market_offer_invalid(market: OneSidedMarket):
         market.offer(10, -1, "someone", "someone")
 
 
-@pytest.mark.parametrize("market, offer", [
-    (TwoSidedMarket(), "offer"),
-    (BalancingMarket(), "balancing_offer"),
-    (SettlementMarket(), "offer")
+@pytest.mark.parametrize("market_cls, offer", [
+    (TwoSidedMarket, "offer"),
+    (BalancingMarket, "balancing_offer"),
+    (SettlementMarket, "offer")
 ])
-def test_market_offer_readonly(market, offer):
+def test_market_offer_readonly(market_cls, offer):
+    market = market_cls()
     market.readonly = True
     with pytest.raises(MarketReadOnlyException):
         getattr(market, offer)(10, 10, "A", "A")
 
 
-@pytest.mark.parametrize("market",
-                         [OneSidedMarket(bc=MagicMock()),
-                          BalancingMarket(bc=MagicMock()),
-                          SettlementMarket(bc=MagicMock())
-                          ])
-def test_market_offer_delete_missing(market):
+@pytest.mark.parametrize("market_cls", [OneSidedMarket, BalancingMarket, SettlementMarket])
+def test_market_offer_delete_missing(market_cls):
+    market = market_cls(bc=_BC_MOCK)
     with pytest.raises(OfferNotFoundException):
         market.delete_offer("no such offer")
 
 
-@pytest.mark.parametrize("market",
-                         [OneSidedMarket(bc=MagicMock()),
-                          BalancingMarket(bc=MagicMock()),
-                          SettlementMarket(bc=MagicMock())])
-def test_market_offer_delete_readonly(market):
+@pytest.mark.parametrize("market_cls", [OneSidedMarket, BalancingMarket, SettlementMarket])
+def test_market_offer_delete_readonly(market_cls):
+    market = market_cls(bc=_BC_MOCK)
     market.readonly = True
     with pytest.raises(MarketReadOnlyException):
         market.delete_offer("no such offer")
 
 
-@pytest.mark.parametrize("market, offer, accept_offer", [
-    (OneSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now(tz=TIME_ZONE)),
-     "offer", "accept_offer"),
-    (BalancingMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now(tz=TIME_ZONE)),
-     "balancing_offer", "accept_offer"),
-    (SettlementMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now(tz=TIME_ZONE)),
-     "offer", "accept_offer")
-])
-def test_market_trade(market, offer, accept_offer):
+@pytest.mark.parametrize("market_cls, offer, accept_offer", MARKET_VARIANTS,
+                         ids=MARKET_VARIANT_IDS)
+def test_market_trade(market_cls, offer, accept_offer, make_market):
+    market = make_market(market_cls, time_slot=now(tz=TIME_ZONE))
     e_offer = getattr(market, offer)(20, 10, "A", "A")
     trade = getattr(market, accept_offer)(offer_or_id=e_offer, buyer="B",
                                           energy=10)
@@ -195,8 +230,8 @@ def test_orders_per_slot(market):
                                            "type": "Offer"}]}}
 
 
-def test_balancing_market_negative_offer_trade(market=BalancingMarket(
-        bc=NonBlockchainInterface(str(uuid4())))):  # NOQA
+def test_balancing_market_negative_offer_trade(fake_bc):
+    market = BalancingMarket(bc=fake_bc)
     offer = market.balancing_offer(20, -10, "A", "A")
     trade = market.accept_offer(offer, "B", energy=-10)
     assert trade
@@ -209,44 +244,29 @@ def test_balancing_market_negative_offer_trade(market=BalancingMarket(
     assert trade.buyer == "B"
 
 
-@pytest.mark.parametrize("market, offer, accept_offer", [
-    (OneSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()),
-     "offer", "accept_offer"),
-    (BalancingMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()),
-     "balancing_offer", "accept_offer"),
-    (SettlementMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()),
-     "offer", "accept_offer")
-])
-def test_market_trade_by_id(market, offer, accept_offer):
+@pytest.mark.parametrize("market_cls, offer, accept_offer", MARKET_VARIANTS,
+                         ids=MARKET_VARIANT_IDS)
+def test_market_trade_by_id(market_cls, offer, accept_offer, make_market):
+    market = make_market(market_cls)
     e_offer = getattr(market, offer)(20, 10, "A", "A")
     trade = getattr(market, accept_offer)(offer_or_id=e_offer.id, buyer="B", energy=10)
     assert trade
 
 
-@pytest.mark.parametrize("market, offer, accept_offer", [
-    (OneSidedMarket(bc=MagicMock(), time_slot=now()),
-     "offer", "accept_offer"),
-    (BalancingMarket(bc=MagicMock(), time_slot=now()),
-     "balancing_offer", "accept_offer"),
-    (SettlementMarket(bc=MagicMock(), time_slot=now()),
-     "offer", "accept_offer")
-])
-def test_market_trade_readonly(market, offer, accept_offer):
+@pytest.mark.parametrize("market_cls, offer, accept_offer", MARKET_VARIANTS,
+                         ids=MARKET_VARIANT_IDS)
+def test_market_trade_readonly(market_cls, offer, accept_offer, make_market):
+    market = make_market(market_cls, bc=_BC_MOCK)
     e_offer = getattr(market, offer)(20, 10, "A", "A")
     market.readonly = True
     with pytest.raises(MarketReadOnlyException):
         getattr(market, accept_offer)(e_offer, "B")
 
 
-@pytest.mark.parametrize("market, offer, accept_offer", [
-    (OneSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()),
-     "offer", "accept_offer"),
-    (BalancingMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()),
-     "balancing_offer", "accept_offer"),
-    (SettlementMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()),
-     "offer", "accept_offer")
-])
-def test_market_trade_not_found(market, offer, accept_offer):
+@pytest.mark.parametrize("market_cls, offer, accept_offer", MARKET_VARIANTS,
+                         ids=MARKET_VARIANT_IDS)
+def test_market_trade_not_found(market_cls, offer, accept_offer, make_market):
+    market = make_market(market_cls)
     e_offer = getattr(market, offer)(20, 10, "A", "A")
 
     assert getattr(market, accept_offer)(offer_or_id=e_offer, buyer="B", energy=10)
@@ -254,15 +274,10 @@ def test_market_trade_not_found(market, offer, accept_offer):
         getattr(market, accept_offer)(offer_or_id=e_offer, buyer="B", energy=10)
 
 
-@pytest.mark.parametrize("market, offer, accept_offer", [
-    (OneSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()),
-     "offer", "accept_offer"),
-    (BalancingMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()),
-     "balancing_offer", "accept_offer"),
-    (SettlementMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()),
-     "offer", "accept_offer")
-])
-def test_market_trade_partial(market, offer, accept_offer):
+@pytest.mark.parametrize("market_cls, offer, accept_offer", MARKET_VARIANTS,
+                         ids=MARKET_VARIANT_IDS)
+def test_market_trade_partial(market_cls, offer, accept_offer, make_market):
+    market = make_market(market_cls)
     e_offer = getattr(market, offer)(20, 20, "A", "A")
 
     trade = getattr(market, accept_offer)(offer_or_id=e_offer, buyer="B", energy=5)
@@ -276,7 +291,7 @@ def test_market_trade_partial(market, offer, accept_offer):
     assert trade.seller == "A"
     assert trade.buyer == "B"
     assert len(market.offers) == 1
-    new_offer = list(market.offers.values())[0]
+    new_offer = next(iter(market.offers.values()))
     assert new_offer is not e_offer
     assert new_offer.energy == 15
     assert new_offer.price == 15
@@ -284,30 +299,24 @@ def test_market_trade_partial(market, offer, accept_offer):
     assert new_offer.id != e_offer.id
 
 
-@pytest.mark.parametrize("market, offer, accept_offer, energy, exception", [
-    (OneSidedMarket(bc=MagicMock(), time_slot=now()),
-     "offer", "accept_offer", 0, InvalidTrade),
-    (OneSidedMarket(bc=MagicMock(), time_slot=now()),
-     "offer", "accept_offer", 21, InvalidTrade),
-    (BalancingMarket(bc=MagicMock(), time_slot=now()),
-     "balancing_offer", "accept_offer", 0,
-     InvalidBalancingTradeException),
-    (BalancingMarket(bc=MagicMock(), time_slot=now()),
-     "balancing_offer", "accept_offer", 21,
-     InvalidBalancingTradeException),
-    (SettlementMarket(bc=MagicMock(), time_slot=now()),
-     "offer", "accept_offer", 0, InvalidTrade),
-    (SettlementMarket(bc=MagicMock(), time_slot=now()),
-     "offer", "accept_offer", 21, InvalidTrade),
+@pytest.mark.parametrize("market_cls, offer, accept_offer, energy, exception", [
+    (OneSidedMarket, "offer", "accept_offer", 0, InvalidTrade),
+    (OneSidedMarket, "offer", "accept_offer", 21, InvalidTrade),
+    (BalancingMarket, "balancing_offer", "accept_offer", 0, InvalidBalancingTradeException),
+    (BalancingMarket, "balancing_offer", "accept_offer", 21, InvalidBalancingTradeException),
+    (SettlementMarket, "offer", "accept_offer", 0, InvalidTrade),
+    (SettlementMarket, "offer", "accept_offer", 21, InvalidTrade),
 ])
-def test_market_trade_partial_invalid(market, offer, accept_offer, energy, exception):
+def test_market_trade_partial_invalid(
+        market_cls, offer, accept_offer, energy, exception, make_market):
+    market = make_market(market_cls, bc=_BC_MOCK)
     e_offer = getattr(market, offer)(20, 20, "A", "A")
     with pytest.raises(exception):
         getattr(market, accept_offer)(offer_or_id=e_offer, buyer="B", energy=energy)
 
 
-def test_market_acct_simple(market=OneSidedMarket(bc=NonBlockchainInterface(str(uuid4())),
-                                                  time_slot=now())):
+def test_market_acct_simple(make_market):
+    market = make_market(OneSidedMarket)
     offer = market.offer(20, 10, "A", "A")
     market.accept_offer(offer, "B")
 
@@ -319,8 +328,8 @@ def test_market_acct_simple(market=OneSidedMarket(bc=NonBlockchainInterface(str(
     assert market.sold_energy("B") == 0
 
 
-def test_market_acct_multiple(market=OneSidedMarket(bc=NonBlockchainInterface(str(uuid4())),
-                                                    time_slot=now())):
+def test_market_acct_multiple(make_market):
+    market = make_market(OneSidedMarket)
     offer1 = market.offer(10, 20, "A", "A")
     offer2 = market.offer(10, 10, "A", "A")
     market.accept_offer(offer1, "B")
@@ -335,27 +344,8 @@ def test_market_acct_multiple(market=OneSidedMarket(bc=NonBlockchainInterface(st
     assert market.bought_energy("C") == offer2.energy == 10
 
 
-@pytest.mark.parametrize("market, offer", [
-    (OneSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()), "offer"),
-    (BalancingMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()), "balancing_offer"),
-    (SettlementMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()), "offer")
-])
-def test_market_sorted_offers(market, offer):
-    getattr(market, offer)(5, 1, "A", "A")
-    getattr(market, offer)(3, 1, "A", "A")
-    getattr(market, offer)(1, 1, "A", "A")
-    getattr(market, offer)(2, 1, "A", "A")
-    getattr(market, offer)(4, 1, "A", "A")
-
-    assert [o.price for o in market.sorted_offers] == [1, 2, 3, 4, 5]
-
-
-@pytest.mark.parametrize("market, offer", [
-    (OneSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()), "offer"),
-    (BalancingMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()), "balancing_offer"),
-    (SettlementMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()), "offer")
-])
-def test_market_most_affordable_offers(market, offer):
+def test_market_sorted_and_most_affordable_offers(market_and_offer):
+    market, offer = market_and_offer
     getattr(market, offer)(5, 1, "A", "A")
     getattr(market, offer)(3, 1, "A", "A")
     getattr(market, offer)(1, 1, "A", "A")
@@ -365,6 +355,7 @@ def test_market_most_affordable_offers(market, offer):
     getattr(market, offer)(2, 1, "A", "A")
     getattr(market, offer)(4, 1, "A", "A")
 
+    assert [o.energy_rate for o in market.sorted_offers] == [1, 1, 1, 1, 2, 3, 4, 5]
     assert {o.price for o in market.most_affordable_offers} == {1, 10, 20, 20000}
 
 
@@ -374,89 +365,89 @@ def test_market_most_affordable_offers(market, offer):
     (SettlementMarket, "offer")
 ])
 def test_market_listeners_init(market, offer, called):
-    markt = market(bc=MagicMock(), time_slot=now(), notification_listener=called)
+    markt = market(bc=_BC_MOCK, time_slot=now(), notification_listener=called)
     getattr(markt, offer)(10, 20, "A", "A")
     assert len(called.calls) == 1
 
 
-@pytest.mark.parametrize("market, offer, add_listener", [
-    (OneSidedMarket(bc=MagicMock(), time_slot=now()), "offer", "add_listener"),
-    (BalancingMarket(bc=MagicMock(), time_slot=now()), "balancing_offer", "add_listener"),
-    (SettlementMarket(bc=MagicMock(), time_slot=now()), "offer", "add_listener")
+@pytest.mark.parametrize("market_cls, offer, add_listener", [
+    (OneSidedMarket, "offer", "add_listener"),
+    (BalancingMarket, "balancing_offer", "add_listener"),
+    (SettlementMarket, "offer", "add_listener")
 ])
-def test_market_listeners_add(market, offer, add_listener, called):
+def test_market_listeners_add(market_cls, offer, add_listener, called, make_market):
+    market = make_market(market_cls, bc=_BC_MOCK)
     getattr(market, add_listener)(called)
     getattr(market, offer)(10, 20, "A", "A")
 
     assert len(called.calls) == 1
 
 
-@pytest.mark.parametrize("market, offer, add_listener, event", [
-    (OneSidedMarket(bc=MagicMock(), time_slot=now()),
-     "offer", "add_listener", MarketEvent.OFFER),
-    (BalancingMarket(bc=MagicMock(), time_slot=now()),
-     "balancing_offer", "add_listener", MarketEvent.BALANCING_OFFER),
-    (SettlementMarket(bc=MagicMock(), time_slot=now()),
-     "offer", "add_listener", MarketEvent.OFFER),
+@pytest.mark.parametrize("market_cls, offer, add_listener, event", [
+    (OneSidedMarket, "offer", "add_listener", MarketEvent.OFFER),
+    (BalancingMarket, "balancing_offer", "add_listener", MarketEvent.BALANCING_OFFER),
+    (SettlementMarket, "offer", "add_listener", MarketEvent.OFFER),
 ])
-def test_market_listeners_offer(market, offer, add_listener, event, called):
+def test_market_listeners_offer(market_cls, offer, add_listener, event, called, make_market):
+    market = make_market(market_cls, bc=_BC_MOCK)
     getattr(market, add_listener)(called)
     e_offer = getattr(market, offer)(10, 20, "A", "A")
     assert len(called.calls) == 1
-    assert called.calls[0][0] == (repr(event),)
+    assert called.calls[0][0] == (_EVENT_REPRS[event],)
     assert called.calls[0][1] == {"offer": repr(e_offer), "market_id": repr(market.id)}
 
 
-@pytest.mark.parametrize("market, offer, accept_offer, add_listener, event", [
-    (OneSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()),
-     "offer", "accept_offer", "add_listener",
-     MarketEvent.OFFER_SPLIT),
-    (BalancingMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()),
-     "balancing_offer", "accept_offer", "add_listener",
+@pytest.mark.parametrize("market_cls, offer, accept_offer, add_listener, event", [
+    (OneSidedMarket, "offer", "accept_offer", "add_listener", MarketEvent.OFFER_SPLIT),
+    (BalancingMarket, "balancing_offer", "accept_offer", "add_listener",
      MarketEvent.BALANCING_OFFER_SPLIT),
-    (SettlementMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()),
-     "offer", "accept_offer", "add_listener",
-     MarketEvent.OFFER_SPLIT),
+    (SettlementMarket, "offer", "accept_offer", "add_listener", MarketEvent.OFFER_SPLIT),
 ])
-def test_market_listeners_offer_split(market, offer, accept_offer, add_listener, event, called):
+def test_market_listeners_offer_split(
+        market_cls, offer, accept_offer, add_listener, event, called, make_market):
+    market = make_market(market_cls)
     getattr(market, add_listener)(called)
     e_offer = getattr(market, offer)(10., 20, "A", "A")
     getattr(market, accept_offer)(e_offer, "B", energy=3.)
     assert len(called.calls) == 3
-    assert called.calls[1][0] == (repr(event),)
+    assert called.calls[1][0] == (_EVENT_REPRS[event],)
     call_kwargs = called.calls[1][1]
     call_kwargs.pop("market_id", None)
-    a_offer = deepcopy(e_offer)
+    a_offer = copy(e_offer)
     a_offer.price = e_offer.price / 20 * 3
     a_offer.energy = e_offer.energy / 20 * 3
     assert call_kwargs == {
         "original_offer": repr(e_offer),
         "accepted_offer": repr(a_offer),
-        "residual_offer": repr(list(market.offers.values())[0])
+        "residual_offer": repr(next(iter(market.offers.values())))
     }
 
 
-@pytest.mark.parametrize("market, offer, delete_offer, add_listener, event", [
-    (OneSidedMarket(bc=MagicMock(), time_slot=now()),
-     "offer", "delete_offer",
-     "add_listener", MarketEvent.OFFER_DELETED),
-    (BalancingMarket(bc=MagicMock(), time_slot=now()),
-     "balancing_offer", "delete_balancing_offer",
+@pytest.mark.parametrize("market_cls, offer, delete_offer, add_listener, event", [
+    (OneSidedMarket, "offer", "delete_offer", "add_listener", MarketEvent.OFFER_DELETED),
+    (BalancingMarket, "balancing_offer", "delete_balancing_offer",
      "add_listener", MarketEvent.BALANCING_OFFER_DELETED),
-    (SettlementMarket(bc=MagicMock(), time_slot=now()),
-     "offer", "delete_offer",
-     "add_listener", MarketEvent.OFFER_DELETED),
+    (SettlementMarket, "offer", "delete_offer", "add_listener", MarketEvent.OFFER_DELETED),
 ])
-def test_market_listeners_offer_deleted(market, offer, delete_offer, add_listener, event, called):
+def test_market_listeners_offer_deleted(
+        market_cls, offer, delete_offer, add_listener, event, called, make_market):
+    market = make_market(market_cls, bc=_BC_MOCK)
     getattr(market, add_listener)(called)
     e_offer = getattr(market, offer)(10, 20, "A", "A")
     getattr(market, delete_offer)(e_offer)
 
     assert len(called.calls) == 2
-    assert called.calls[1][0] == (repr(event),)
+    assert called.calls[1][0] == (_EVENT_REPRS[event],)
     assert called.calls[1][1] == {"offer": repr(e_offer), "market_id": repr(market.id)}
 
 
+@pytest.fixture(name="acct_market")
+def acct_market_fixture(make_market):
+    """Return a fresh one-sided market together with the two offers seller A starts with."""
+    market = make_market(OneSidedMarket)
+    return market, market.offer(10, 20, "A", "A"), market.offer(10, 10, "A", "A")
+
+
 @pytest.mark.parametrize(
     ("last_offer_size", "traded_energy"),
     (
@@ -465,10 +456,8 @@ def test_market_listeners_offer_deleted(market, offer, delete_offer, add_listene
             (40, -10)
     )
 )
-def test_market_issuance_acct_reverse(last_offer_size, traded_energy):
-    market = OneSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now())
-    offer1 = market.offer(10, 20, "A", "A")
-    offer2 = market.offer(10, 10, "A", "A")
+def test_market_issuance_acct_reverse(last_offer_size, traded_energy, acct_market):
+    market, offer1, offer2 = acct_market
     offer3 = market.offer(10, last_offer_size, "D", "D")
 
     market.accept_offer(offer1, "B")
@@ -477,15 +466,11 @@ def test_market_issuance_acct_reverse(last_offer_size, traded_energy):
     assert market.traded_energy["A"] == traded_energy
 
 
-@pytest.mark.parametrize("market, offer, accept_offer", [
-    (OneSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()), "offer",
-     "accept_offer"),
-    (BalancingMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()), "balancing_offer",
-     "accept_offer"),
-    (SettlementMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now()), "offer",
-     "accept_offer")
-])
-def test_market_accept_offer_yields_partial_trade(market, offer, accept_offer):
+@pytest.mark.parametrize("market_cls, offer, accept_offer", MARKET_VARIANTS,
+                         ids=MARKET_VARIANT_IDS)
+def test_market_accept_offer_yields_partial_trade(
+        market_cls, offer, accept_offer, make_market):
+    market = make_market(market_cls)
     e_offer = getattr(market, offer)(2.0, 4, "seller", "seller")
     trade = getattr(market, accept_offer)(e_offer, "buyer", energy=1)
     assert (trade.offer_bid.id == e_offer.id
@@ -496,25 +481,29 @@ def test_market_accept_offer_yields_partial_trade(market, offer, accept_offer):
 class MarketStateMachine(RuleBasedStateMachine):
     offers = Bundle("Offers")
     actors = Bundle("Actors")
+    bc = NonBlockchainInterface(str(uuid4()))
 
     def __init__(self):
-        self.market = OneSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now())
+        self.market = OneSidedMarket(bc=self.bc, time_slot=now())
+        self._actor_sums = {}
         super().__init__()
 
-    @rule(target=actors, actor=st.text(min_size=1, max_size=3,
-                                       alphabet=string.ascii_letters + string.digits))
+    @rule(target=actors, actor=_ACTOR_STRATEGY)
     def new_actor(self, actor):
         return actor
 
-    @rule(target=offers, seller=actors, energy=st.integers(min_value=1),
-          price=st.integers(min_value=0))
+    @rule(target=offers, seller=actors, energy=st.sampled_from((1, 5, 10, 20, 100)),
+          price=st.integers(min_value=0, max_value=10**6))
     def offer(self, seller, energy, price):
         return self.market.offer(price, energy, seller, seller)
 
     @rule(offer=offers, buyer=actors)
     def trade(self, offer, buyer):
         assume(offer.id in self.market.offers)
-        self.market.accept_offer(offer, buyer)
+        trade = self.market.accept_offer(offer, buyer)
+        self._actor_sums = add_or_create_key(self._actor_sums, trade.seller, trade.traded_energy)
+        self._actor_sums = subtract_or_create_key(
+            self._actor_sums, trade.buyer, trade.traded_energy)
 
     @precondition(lambda self: self.market.trades)
     @rule()
@@ -526,13 +515,14 @@ class MarketStateMachine(RuleBasedStateMachine):
     @precondition(lambda self: self.market.traded_energy)
     @rule()
     def check_acct(self):
-        actor_sums = {}
-        for t in self.market.trades:
-            actor_sums = add_or_create_key(actor_sums, t.seller, t.traded_energy)
-            actor_sums = subtract_or_create_key(actor_sums, t.buyer, t.traded_energy)
-        for actor, sum_ in actor_sums.items():
+        for actor, sum_ in self._actor_sums.items():
             assert self.market.traded_energy[actor] == sum_
         assert sum(self.market.traded_energy.values()) == 0
 
 
+# Shrinking replays the market operations many times; CI_FAST runs skip it.
+MarketStateMachine.TestCase.settings = settings(
+    max_examples=50, stateful_step_count=20, deadline=None,
+    phases=([phase for phase in Phase if phase is not Phase.shrink]
+            if os.environ.get("CI_FAST") else list(Phase)))
 TestMarketIOU = MarketStateMachine.TestCase
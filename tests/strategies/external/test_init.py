@@ -24,13 +24,14 @@ import pytest
 from gsy_framework.constants_limits import ConstSettings, GlobalConfig
 from gsy_framework.data_classes import Bid, Offer, Trade
 from gsy_framework.utils import format_datetime
-from parameterized import parameterized
 from pendulum import datetime, duration, now
 from redis.exceptions import RedisError
 
 import gsy_e.constants
-import gsy_e.gsy_e_core.util
 from gsy_e.gsy_e_core.global_objects_singleton import global_objects
+from gsy_e.gsy_e_core.redis_connections.aggregator_connection import AggregatorHandler
+from gsy_e.gsy_e_core.redis_connections.redis_area_market_communicator import (
+    ExternalConnectionCommunicator)
 from gsy_e.models.area import Area
 from gsy_e.models.strategy import BidEnabledStrategy
 from gsy_e.models.strategy.external_strategies import (
@@ -43,11 +44,56 @@ from gsy_e.models.strategy.external_strategies.pv import (
 from gsy_e.models.strategy.external_strategies.storage import StorageExternalStrategy
 
 transaction_id = str(uuid.uuid4())
-
-
-@pytest.fixture
+_NOW = now()
+_NOW_STR = _NOW.format(gsy_e.constants.DATE_TIME_FORMAT)
+_SAMPLE_BID = Bid("bid_id", _NOW, 20, 1.0, "test_area")
+_SAMPLE_OFFER = Offer("offer_id", _NOW, 20, 1.0, "test_area")
+_STRATEGY_FACTORIES = [
+    lambda: LoadHoursExternalStrategy(100),
+    lambda: PVExternalStrategy(2, capacity_kW=0.16),
+    StorageExternalStrategy]
+_STRATEGY_IDS = ["load", "pv", "storage"]
+_TRANSACTION_ONLY_PAYLOAD = {"data": json.dumps({"transaction_id": transaction_id})}
+_NULL_TRANSACTION_PAYLOAD = {"data": json.dumps({"transaction_id": None})}
+_EXPECTED_TRADE_EVENT_KEYS = frozenset({
+    "attributes", "residual_bid_id", "asset_id", "buyer", "local_market_fee",
+    "residual_offer_id", "total_fee", "traded_energy", "bid_id", "time", "seller",
+    "trade_price", "trade_id", "offer_id", "event", "seller_origin", "buyer_origin"})
+_START_DATE_STR = GlobalConfig.start_date.format(gsy_e.constants.DATE_TIME_FORMAT)
+_RESPONSE_CHANNEL = "response_channel"
+
+
+def _one_call(mock):
+    """Return the args and kwargs of the only call made to the mock."""
+    (args, kwargs), = mock.call_args_list
+    return args, kwargs
+
+
+def _response_channel(strategy, command_name):
+    """Return the redis channel the strategy answers the given command on."""
+    return f"{strategy.channel_prefix}/response/{command_name}"
+
+
+def _incorrect_request_response(command_name):
+    """Return the error a forecast strategy publishes for a malformed command payload."""
+    argument_name = command_name[len("set_"):]
+    return {"command": command_name,
+            "error": f"Incorrect {command_name} request. "
+                     f"Available parameters: ({argument_name}).",
+            "transaction_id": transaction_id}
+
+
+def _create_redis_communicator_mock():
+    """Return a communicator mock that only exposes the real communicator's interface."""
+    redis_communicator = Mock(spec=ExternalConnectionCommunicator)
+    redis_communicator.aggregator = Mock(spec=AggregatorHandler)
+    return redis_communicator
+
+
+@pytest.fixture(scope="module", params=[LoadForecastExternalStrategy, PVForecastExternalStrategy],
+                ids=["load", "pv"])
 def ext_strategy_fixture(request):
-    strategy = request.param
+    strategy = request.param()
     config = Mock()
     config.slot_length = duration(minutes=15)
     config.tick_length = duration(seconds=15)
@@ -60,17 +106,29 @@ def ext_strategy_fixture(request):
     parent = Area(name="parent_area", children=[area], config=config)
     parent.activate()
     strategy.connected = True
-    market = MagicMock()
-    market.time_slot = GlobalConfig.start_date
     return strategy
 
 
+@pytest.fixture(name="activated_load_area", scope="class")
+def activated_load_area_fixture():
+    """Return an activated area with an external load strategy, shared across a test class."""
+    config = MagicMock()
+    config.capacity_kW = 0.160
+    config.ticks_per_slot = 90
+    GlobalConfig.end_date = GlobalConfig.start_date + duration(days=1)
+    area = Area(name="test_area", config=config, strategy=LoadHoursExternalStrategy(100),
+                external_connection_available=True)
+    Area(name="parent_area", children=[area]).activate()
+    return area
+
+
 class TestExternalMixin:
 
     def _create_and_activate_strategy_area(self, strategy):
         self.config = MagicMock()
         self.config.capacity_kW = 0.160
         self.config.ticks_per_slot = 90
+        self.config.external_redis_communicator = _create_redis_communicator_mock()
         GlobalConfig.end_date = GlobalConfig.start_date + duration(days=1)
         self.area = Area(name="test_area", config=self.config, strategy=strategy,
                          external_connection_available=True)
@@ -83,158 +141,118 @@ class TestExternalMixin:
         self.parent.get_future_market_from_id = lambda _: market
         self.area.get_future_market_from_id = lambda _: market
 
-    def teardown_method(self) -> None:
-        ConstSettings.MASettings.MARKET_TYPE = 1
-
-    def test_dispatch_tick_frequency_gets_calculated_correctly(self):
-        self.external_strategy = LoadHoursExternalStrategy(100)
-        self._create_and_activate_strategy_area(self.external_strategy)
-        gsy_e.gsy_e_core.util.gsy_e.constants.DISPATCH_EVENT_TICK_FREQUENCY_PERCENT = 20
-        self.config.ticks_per_slot = 90
-        global_objects.external_global_stats(self.area, self.config.ticks_per_slot)
-        assert global_objects.external_global_stats.\
-            external_tick_counter._dispatch_tick_frequency == 18
-        self.config.ticks_per_slot = 10
-        global_objects.external_global_stats(self.area, self.config.ticks_per_slot)
-        assert global_objects.external_global_stats.\
-            external_tick_counter._dispatch_tick_frequency == 2
-        self.config.ticks_per_slot = 100
-        global_objects.external_global_stats(self.area, self.config.ticks_per_slot)
-        assert global_objects.external_global_stats.\
-            external_tick_counter._dispatch_tick_frequency == 20
-        self.config.ticks_per_slot = 99
-        global_objects.external_global_stats(self.area, self.config.ticks_per_slot)
-        assert global_objects.external_global_stats.\
-            external_tick_counter._dispatch_tick_frequency == 19
-        gsy_e.gsy_e_core.util.gsy_e.constants.DISPATCH_EVENT_TICK_FREQUENCY_PERCENT = 50
-        self.config.ticks_per_slot = 90
-        global_objects.external_global_stats(self.area, self.config.ticks_per_slot)
-        assert global_objects.external_global_stats.\
-            external_tick_counter._dispatch_tick_frequency == 45
-        self.config.ticks_per_slot = 10
-        global_objects.external_global_stats(self.area, self.config.ticks_per_slot)
-        assert global_objects.external_global_stats.\
-            external_tick_counter._dispatch_tick_frequency == 5
-        self.config.ticks_per_slot = 100
-        global_objects.external_global_stats(self.area, self.config.ticks_per_slot)
-        assert global_objects.external_global_stats.\
-            external_tick_counter._dispatch_tick_frequency == 50
-        self.config.ticks_per_slot = 99
-        global_objects.external_global_stats(self.area, self.config.ticks_per_slot)
+    def _prepare_trade_env(self, strategy):
+        """Activate the strategy area and give the strategy energy to trade in its market."""
+        strategy._track_energy_sell_type = lambda _: None
+        self._create_and_activate_strategy_area(strategy)
+        market = self.area.get_future_market_from_id(1)
+        self.area._markets.markets = {1: market}
+        strategy.state._available_energy_kWh = {market.time_slot: 1000.0}
+        strategy.state.pledged_sell_kWh = {market.time_slot: 0.0}
+        strategy.state.offered_sell_kWh = {market.time_slot: 0.0}
+        return market, _NOW
+
+    @pytest.mark.parametrize("frequency_percent, ticks_per_slot, dispatch_tick_frequency", [
+        (20, 90, 18), (20, 10, 2), (20, 100, 20), (20, 99, 19),
+        (50, 90, 45), (50, 10, 5), (50, 100, 50), (50, 99, 49)])
+    def test_dispatch_tick_frequency_gets_calculated_correctly(
+            self, activated_load_area, frequency_percent, ticks_per_slot,
+            dispatch_tick_frequency, monkeypatch):
+        monkeypatch.setattr(
+            gsy_e.constants, "DISPATCH_EVENT_TICK_FREQUENCY_PERCENT", frequency_percent)
+        global_objects.external_global_stats(activated_load_area, ticks_per_slot)
         assert global_objects.external_global_stats.\
-            external_tick_counter._dispatch_tick_frequency == 49
-
-    @parameterized.expand([
-        [LoadHoursExternalStrategy(100)],
-        [PVExternalStrategy(2, capacity_kW=0.16)],
-        [StorageExternalStrategy()]
-    ])
-    def test_dispatch_event_tick_to_external_aggregator(self, strategy):
-        gsy_e.gsy_e_core.util.gsy_e.constants.DISPATCH_EVENT_TICK_FREQUENCY_PERCENT = 20
+            external_tick_counter._dispatch_tick_frequency == dispatch_tick_frequency
+
+    @pytest.mark.parametrize("strategy_factory", _STRATEGY_FACTORIES, ids=_STRATEGY_IDS)
+    def test_dispatch_event_tick_to_external_aggregator(self, strategy_factory, monkeypatch):
+        strategy = strategy_factory()
+        monkeypatch.setattr(gsy_e.constants, "DISPATCH_EVENT_TICK_FREQUENCY_PERCENT", 20)
         self._create_and_activate_strategy_area(strategy)
         strategy.redis.aggregator.is_controlling_device = lambda _: True
         self.config.ticks_per_slot = 90
         strategy.event_activate()
         assert global_objects.external_global_stats.\
             external_tick_counter._dispatch_tick_frequency == 18
-        self.area.current_tick = 1
-        strategy._dispatch_event_tick_to_external_agent()
-        strategy.redis.aggregator.add_batch_tick_event.assert_not_called()
-        self.area.current_tick = 17
-        strategy._dispatch_event_tick_to_external_agent()
-        strategy.redis.aggregator.add_batch_tick_event.assert_not_called()
-        self.area.current_tick = 18
-        strategy._dispatch_event_tick_to_external_agent()
-        strategy.redis.aggregator.add_batch_tick_event.assert_called_once()
-        assert strategy.redis.aggregator.add_batch_tick_event.call_args_list[0][0][0] == \
-            self.area.uuid
-        result = strategy.redis.aggregator.add_batch_tick_event.call_args_list[0][0][1]
-        assert result == \
-            {"market_slot": GlobalConfig.start_date.format(gsy_e.constants.DATE_TIME_FORMAT),
-             "slot_completion": "20%"}
-        strategy.redis.reset_mock()
-        strategy.redis.aggregator.add_batch_tick_event.reset_mock()
-        self.area.current_tick = 35
-        strategy._dispatch_event_tick_to_external_agent()
-        strategy.redis.aggregator.add_batch_tick_event.assert_not_called()
-        self.area.current_tick = 36
-        strategy._dispatch_event_tick_to_external_agent()
-        strategy.redis.aggregator.add_batch_tick_event.assert_called_once()
-        assert strategy.redis.aggregator.add_batch_tick_event.call_args_list[0][0][0] == \
-            self.area.uuid
-        result = strategy.redis.aggregator.add_batch_tick_event.call_args_list[0][0][1]
-        assert result == \
-            {"market_slot": GlobalConfig.start_date.format(gsy_e.constants.DATE_TIME_FORMAT),
-             "slot_completion": "40%"}
-
-    @parameterized.expand([
-        [LoadHoursExternalStrategy(100)],
-        [PVExternalStrategy(2, capacity_kW=0.16)],
-        [StorageExternalStrategy()]
-    ])
-    def test_dispatch_event_tick_to_external_agent(self, strategy):
-        gsy_e.gsy_e_core.util.gsy_e.constants.DISPATCH_EVENT_TICK_FREQUENCY_PERCENT = 20
+        call_counts = []
+        for current_tick in (1, 17, 18, 35, 36):
+            self.area.current_tick = current_tick
+            strategy._dispatch_event_tick_to_external_agent()
+            call_counts.append(strategy.redis.aggregator.add_batch_tick_event.call_count)
+        assert call_counts == [0, 0, 1, 1, 2]
+        tick_calls = strategy.redis.aggregator.add_batch_tick_event.call_args_list
+        assert [call[0][0] for call in tick_calls] == [self.area.uuid, self.area.uuid]
+        assert [call[0][1] for call in tick_calls] == [
+            {"market_slot": _START_DATE_STR,
+             "slot_completion": "20%"},
+            {"market_slot": _START_DATE_STR,
+             "slot_completion": "40%"}]
+
+    @pytest.mark.parametrize("strategy_factory", _STRATEGY_FACTORIES, ids=_STRATEGY_IDS)
+    def test_dispatch_event_tick_to_external_agent(self, strategy_factory, monkeypatch):
+        strategy = strategy_factory()
+        monkeypatch.setattr(gsy_e.constants, "DISPATCH_EVENT_TICK_FREQUENCY_PERCENT", 20)
         self._create_and_activate_strategy_area(strategy)
         strategy.redis.aggregator.is_controlling_device = lambda _: False
         self.config.ticks_per_slot = 90
         strategy.event_activate()
         assert global_objects.external_global_stats.\
             external_tick_counter._dispatch_tick_frequency == 18
-        self.area.current_tick = 1
-        strategy._dispatch_event_tick_to_external_agent()
-        strategy.redis.publish_json.assert_not_called()
-        self.area.current_tick = 17
-        strategy._dispatch_event_tick_to_external_agent()
-        strategy.redis.publish_json.assert_not_called()
-        self.area.current_tick = 18
-        strategy._dispatch_event_tick_to_external_agent()
-        strategy.redis.publish_json.assert_called_once()
-        assert strategy.redis.publish_json.call_args_list[0][0][0] == "test_area/events/tick"
-        result = strategy.redis.publish_json.call_args_list[0][0][1]
-        result.pop("area_uuid")
-        assert result == \
+        device_info = strategy._device_info_dict
+        call_counts = []
+        for current_tick in (1, 17, 18, 35, 36):
+            self.area.current_tick = current_tick
+            strategy._dispatch_event_tick_to_external_agent()
+            call_counts.append(strategy.redis.publish_json.call_count)
+        assert call_counts == [0, 0, 1, 1, 2]
+        tick_calls = strategy.redis.publish_json.call_args_list
+        assert [call[0][0] for call in tick_calls] == ["test_area/events/tick"] * 2
+        results = [call[0][1] for call in tick_calls]
+        for result in results:
+            result.pop("area_uuid")
+        assert results == [
             {"slot_completion": "20%",
-             "market_slot": GlobalConfig.start_date.format(gsy_e.constants.DATE_TIME_FORMAT),
+             "market_slot": _START_DATE_STR,
              "event": "tick",
-             "device_info": strategy._device_info_dict}
-
-        strategy.redis.reset_mock()
-        strategy.redis.publish_json.reset_mock()
-        self.area.current_tick = 35
-        strategy._dispatch_event_tick_to_external_agent()
-        strategy.redis.publish_json.assert_not_called()
-        self.area.current_tick = 36
-        strategy._dispatch_event_tick_to_external_agent()
-        strategy.redis.publish_json.assert_called_once()
-        assert strategy.redis.publish_json.call_args_list[0][0][0] == "test_area/events/tick"
-        result = strategy.redis.publish_json.call_args_list[0][0][1]
-        result.pop("area_uuid")
-        assert result == \
+             "device_info": device_info},
             {"slot_completion": "40%",
-             "market_slot": GlobalConfig.start_date.format(gsy_e.constants.DATE_TIME_FORMAT),
+             "market_slot": _START_DATE_STR,
              "event": "tick",
-             "device_info": strategy._device_info_dict}
-
-    @parameterized.expand([
-        [LoadHoursExternalStrategy(100),
-         Bid("bid_id", now(), 20, 1.0, "test_area")],
-        [PVExternalStrategy(2, capacity_kW=0.16),
-         Offer("offer_id", now(), 20, 1.0, "test_area")],
-        [StorageExternalStrategy(),
-         Bid("bid_id", now(), 20, 1.0, "test_area")],
-        [StorageExternalStrategy(),
-         Offer("offer_id", now(), 20, 1.0, "test_area")]
-    ])
-    def test_dispatch_event_trade_to_external_aggregator(self, strategy, offer_bid):
-        strategy._track_energy_sell_type = lambda _: None
+             "device_info": device_info}]
+
+    @pytest.mark.parametrize("strategy_factory", _STRATEGY_FACTORIES, ids=_STRATEGY_IDS)
+    def test_dispatched_tick_events_are_published_as_one_aggregator_batch(
+            self, strategy_factory, monkeypatch):
+        strategy = strategy_factory()
+        monkeypatch.setattr(gsy_e.constants, "DISPATCH_EVENT_TICK_FREQUENCY_PERCENT", 20)
         self._create_and_activate_strategy_area(strategy)
+        aggregator = AggregatorHandler(MagicMock())
+        aggregator.set_aggregator_device_mapping({"aggregator_uuid": [self.area.uuid]})
+        self.config.external_redis_communicator.aggregator = aggregator
+        strategy.event_activate()
+        for current_tick in (18, 36):
+            self.area.current_tick = current_tick
+            strategy._dispatch_event_tick_to_external_agent()
+
+        redis_communicator = MagicMock()
+        aggregator.publish_all_events(redis_communicator)
+        redis_communicator.publish_json.assert_called_once()
+        channel, tick_event = redis_communicator.publish_json.call_args[0]
+        assert channel.endswith("/aggregator_uuid/events/all")
+        assert tick_event["event"] == "tick"
+        assert tick_event["slot_completion"] == "40%"
+        assert aggregator.batch_tick_events == {}
+
+    @pytest.mark.parametrize("strategy_factory, offer_bid", [
+        (lambda: LoadHoursExternalStrategy(100), _SAMPLE_BID),
+        (lambda: PVExternalStrategy(2, capacity_kW=0.16), _SAMPLE_OFFER),
+        (StorageExternalStrategy, _SAMPLE_BID),
+        (StorageExternalStrategy, _SAMPLE_OFFER)
+    ], ids=["load-bid", "pv-offer", "storage-bid", "storage-offer"])
+    def test_dispatch_event_trade_to_external_aggregator(self, strategy_factory, offer_bid):
+        strategy = strategy_factory()
+        market, current_time = self._prepare_trade_env(strategy)
         strategy.redis.aggregator.is_controlling_device = lambda _: True
-        market = self.area.get_future_market_from_id(1)
-        self.area._markets.markets = {1: market}
-        strategy.state._available_energy_kWh = {market.time_slot: 1000.0}
-        strategy.state.pledged_sell_kWh = {market.time_slot: 0.0}
-        strategy.state.offered_sell_kWh = {market.time_slot: 0.0}
-        current_time = now()
         if isinstance(offer_bid, Bid):
             self.area.strategy.add_bid_to_posted(market.id, offer_bid)
             trade = Trade("id", current_time, offer_bid,
@@ -249,15 +267,9 @@ class TestExternalMixin:
                           traded_energy=1, trade_price=20)
 
         strategy.event_offer_traded(market_id="test_market", trade=trade)
-        assert strategy.redis.aggregator.add_batch_trade_event.call_args_list[0][0][0] == \
-            self.area.uuid
-
-        call_args = strategy.redis.aggregator.add_batch_trade_event.call_args_list[0][0][1]
-        assert set(call_args.keys()) == {"attributes", "residual_bid_id", "asset_id", "buyer",
-                                         "local_market_fee", "residual_offer_id", "total_fee",
-                                         "traded_energy", "bid_id", "time", "seller",
-                                         "trade_price", "trade_id", "offer_id", "event",
-                                         "seller_origin", "buyer_origin"}
+        (area_uuid, call_args), _ = _one_call(strategy.redis.aggregator.add_batch_trade_event)
+        assert area_uuid == self.area.uuid
+        assert call_args.keys() == _EXPECTED_TRADE_EVENT_KEYS
         assert call_args["trade_id"] == trade.id
         assert call_args["asset_id"] == self.area.uuid
         assert call_args["event"] == "trade"
@@ -278,27 +290,17 @@ class TestExternalMixin:
             assert call_args["seller"] == "anonymous"
             assert call_args["buyer"] == trade.buyer
 
-    @parameterized.expand([
-        [LoadHoursExternalStrategy(100)],
-        [PVExternalStrategy(2, capacity_kW=0.16)],
-        [StorageExternalStrategy()]
-    ])
-    def test_dispatch_event_trade_to_external_agent(self, strategy):
-        strategy._track_energy_sell_type = lambda _: None
-        self._create_and_activate_strategy_area(strategy)
+    @pytest.mark.parametrize("strategy_factory", _STRATEGY_FACTORIES, ids=_STRATEGY_IDS)
+    def test_dispatch_event_trade_to_external_agent(self, strategy_factory):
+        strategy = strategy_factory()
+        _, current_time = self._prepare_trade_env(strategy)
         strategy.redis.aggregator.is_controlling_device = lambda _: False
-        market = self.area.get_future_market_from_id(1)
-        self.area._markets.markets = {1: market}
-        strategy.state._available_energy_kWh = {market.time_slot: 1000.0}
-        strategy.state.pledged_sell_kWh = {market.time_slot: 0.0}
-        strategy.state.offered_sell_kWh = {market.time_slot: 0.0}
-        current_time = now()
-        trade = Trade("id", current_time, Offer("offer_id", now(), 20, 1.0, "test_area"),
+        trade = Trade("id", current_time, _SAMPLE_OFFER,
                       "test_area", "parent_area", fee_price=0.23,
                       traded_energy=1, trade_price=20)
         strategy.event_offer_traded(market_id="test_market", trade=trade)
-        assert strategy.redis.publish_json.call_args_list[0][0][0] == "test_area/events/trade"
-        call_args = strategy.redis.publish_json.call_args_list[0][0][1]
+        (channel, call_args), _ = _one_call(strategy.redis.publish_json)
+        assert channel == "test_area/events/trade"
         assert call_args["trade_id"] == trade.id
         assert call_args["event"] == "trade"
         assert call_args["trade_price"] == 20
@@ -311,23 +313,14 @@ class TestExternalMixin:
         assert call_args["buyer"] == "anonymous"
         assert call_args["device_info"] == strategy._device_info_dict
 
-    @parameterized.expand([
-        [LoadHoursExternalStrategy(100)],
-        [PVExternalStrategy(2, capacity_kW=0.16)],
-        [StorageExternalStrategy()]
-    ])
-    def test_skip_dispatch_double_event_trade_to_external_agent_two_sided_market(self, strategy):
-        ConstSettings.MASettings.MARKET_TYPE = 2
-        strategy._track_energy_sell_type = lambda _: None
-        self._create_and_activate_strategy_area(strategy)
-        market = self.area.get_future_market_from_id(1)
-        self.area._markets.markets = {1: market}
-        strategy.state._available_energy_kWh = {market.time_slot: 1000.0}
-        strategy.state.pledged_sell_kWh = {market.time_slot: 0.0}
-        strategy.state.offered_sell_kWh = {market.time_slot: 0.0}
-        current_time = now()
+    @pytest.mark.parametrize("strategy_factory", _STRATEGY_FACTORIES, ids=_STRATEGY_IDS)
+    def test_skip_dispatch_double_event_trade_to_external_agent_two_sided_market(
+            self, strategy_factory, monkeypatch):
+        strategy = strategy_factory()
+        monkeypatch.setattr(ConstSettings.MASettings, "MARKET_TYPE", 2)
+        market, current_time = self._prepare_trade_env(strategy)
         if isinstance(strategy, BidEnabledStrategy):
-            bid = Bid("offer_id", now(), 20, 1.0, "test_area")
+            bid = Bid("offer_id", _NOW, 20, 1.0, "test_area")
             strategy.add_bid_to_posted(market.id, bid)
             skipped_trade = (
                 Trade("id", current_time, bid, "test_area", "parent_area",
@@ -341,10 +334,10 @@ class TestExternalMixin:
                 Trade("id", current_time, bid, "parent_area", "test_area",
                       fee_price=0.23, traded_energy=1, trade_price=1))
             strategy.event_offer_traded(market_id=market.id, trade=published_trade)
-            assert strategy.redis.aggregator.add_batch_trade_event.call_args_list[0][0][0] == \
-                self.area.uuid
+            (area_uuid, _), _ = _one_call(strategy.redis.aggregator.add_batch_trade_event)
+            assert area_uuid == self.area.uuid
         else:
-            offer = Offer("offer_id", now(), 20, 1.0, "test_area")
+            offer = Offer("offer_id", _NOW, 20, 1.0, "test_area")
             strategy.offers.post(offer, market.id)
             skipped_trade = (
                 Trade("id", current_time, offer, "parent_area", "test_area",
@@ -359,8 +352,8 @@ class TestExternalMixin:
                 Trade("id", current_time, offer, "test_area", "parent_area",
                       fee_price=0.23, traded_energy=1, trade_price=1))
             strategy.event_offer_traded(market_id=market.id, trade=published_trade)
-            assert strategy.redis.aggregator.add_batch_trade_event.call_args_list[0][0][0] == \
-                self.area.uuid
+            (area_uuid, _), _ = _one_call(strategy.redis.aggregator.add_batch_trade_event)
+            assert area_uuid == self.area.uuid
 
     def test_device_info_dict_for_load_strategy_reports_required_energy(self):
         strategy = LoadHoursExternalStrategy(100)
@@ -385,15 +378,12 @@ class TestExternalMixin:
         assert strategy._device_info_dict["used_storage"] == 0.01
         assert strategy._device_info_dict["free_storage"] == 0.49
 
-    @parameterized.expand([
-        [LoadHoursExternalStrategy(100)],
-        [PVExternalStrategy(2, capacity_kW=0.16)],
-        [StorageExternalStrategy()]
-    ])
-    def test_register_device(self, strategy):
+    @pytest.mark.parametrize("strategy_factory", _STRATEGY_FACTORIES, ids=_STRATEGY_IDS)
+    def test_register_device(self, strategy_factory):
+        strategy = strategy_factory()
         self.config = MagicMock()
         self.device = Area(name="test_area", config=self.config, strategy=strategy)
-        payload = {"data": json.dumps({"transaction_id": transaction_id})}
+        payload = _TRANSACTION_ONLY_PAYLOAD
         self.device.strategy.owner = self.device
         assert self.device.strategy.connected is False
         self.device.strategy._register(payload)
@@ -403,18 +393,15 @@ class TestExternalMixin:
         self.device.strategy._update_connection_status()
         assert self.device.strategy.connected is False
 
-        payload = {"data": json.dumps({"transaction_id": None})}
+        payload = _NULL_TRANSACTION_PAYLOAD
         with pytest.raises(ValueError):
             self.device.strategy._register(payload)
         with pytest.raises(ValueError):
             self.device.strategy._unregister(payload)
 
-    @parameterized.expand([
-        [LoadHoursExternalStrategy(100)],
-        [PVExternalStrategy(2, capacity_kW=0.16)],
-        [StorageExternalStrategy()]
-    ])
-    def test_get_state(self, strategy):
+    @pytest.mark.parametrize("strategy_factory", _STRATEGY_FACTORIES, ids=_STRATEGY_IDS)
+    def test_get_state(self, strategy_factory):
+        strategy = strategy_factory()
         strategy.state.get_state = MagicMock(return_value={"available_energy": 500})
         strategy.connected = True
         strategy._use_template_strategy = True
@@ -423,12 +410,9 @@ class TestExternalMixin:
         assert current_state["use_template_strategy"] is True
         assert current_state["available_energy"] == 500
 
-    @parameterized.expand([
-        [LoadHoursExternalStrategy(100)],
-        [PVExternalStrategy(2, capacity_kW=0.16)],
-        [StorageExternalStrategy()]
-    ])
-    def test_restore_state(self, strategy):
+    @pytest.mark.parametrize("strategy_factory", _STRATEGY_FACTORIES, ids=_STRATEGY_IDS)
+    def test_restore_state(self, strategy_factory):
+        strategy = strategy_factory()
         strategy.state.restore_state = MagicMock()
         strategy.connected = True
         strategy._is_registered = True
@@ -444,40 +428,31 @@ class TestExternalMixin:
         assert strategy._use_template_strategy is False
         strategy.state.restore_state.assert_called_once_with(state_dict)
 
-    @pytest.mark.parametrize("strategy", [
-        LoadHoursExternalStrategy(100),
-        PVExternalStrategy(2, capacity_kW=0.16),
-        StorageExternalStrategy()
-    ])
-    def test_get_market_from_cmd_arg_returns_spot_market_if_arg_missing(self, strategy):
+    @pytest.mark.parametrize("strategy_factory", _STRATEGY_FACTORIES, ids=_STRATEGY_IDS)
+    def test_get_market_from_cmd_arg_returns_spot_market_if_arg_missing(self, strategy_factory):
+        strategy = strategy_factory()
         strategy.area = Mock()
         strategy.area.spot_market = Mock()
         market = strategy._get_market_from_command_argument({})
         assert market == strategy.area.spot_market
 
-    @pytest.mark.parametrize("strategy", [
-        LoadHoursExternalStrategy(100),
-        PVExternalStrategy(2, capacity_kW=0.16),
-        StorageExternalStrategy()
-    ])
-    def test_get_market_from_cmd_arg_returns_spot_market(self, strategy):
+    @pytest.mark.parametrize("strategy_factory", _STRATEGY_FACTORIES, ids=_STRATEGY_IDS)
+    def test_get_market_from_cmd_arg_returns_spot_market(self, strategy_factory):
+        strategy = strategy_factory()
         strategy.area = Mock()
         strategy.area.spot_market = Mock()
-        time_slot = format_datetime(now())
+        time_slot = format_datetime(_NOW)
         market_mock = Mock()
         strategy.area.get_market = MagicMock(return_value=market_mock)
         market = strategy._get_market_from_command_argument({"time_slot": time_slot})
         assert market == market_mock
 
-    @pytest.mark.parametrize("strategy", [
-        LoadHoursExternalStrategy(100),
-        PVExternalStrategy(2, capacity_kW=0.16),
-        StorageExternalStrategy()
-    ])
-    def test_get_market_from_cmd_arg_returns_settlement_market(self, strategy):
+    @pytest.mark.parametrize("strategy_factory", _STRATEGY_FACTORIES, ids=_STRATEGY_IDS)
+    def test_get_market_from_cmd_arg_returns_settlement_market(self, strategy_factory):
+        strategy = strategy_factory()
         strategy.area = Mock()
         strategy.area.spot_market = Mock()
-        time_slot = format_datetime(now())
+        time_slot = format_datetime(_NOW)
         market_mock = Mock()
         strategy.area.get_market = MagicMock(return_value=None)
         strategy.area.get_settlement_market = MagicMock(return_value=market_mock)
@@ -485,15 +460,16 @@ class TestExternalMixin:
         assert market == market_mock
 
     @staticmethod
-    @pytest.mark.parametrize("strategy", [
-        LoadHoursExternalStrategy(100),
-        LoadProfileExternalStrategy(),
-        PVExternalStrategy(2, capacity_kW=0.16),
-        PVUserProfileExternalStrategy(),
-        PVPredefinedExternalStrategy(),
-        StorageExternalStrategy()])
-    def test_filter_degrees_of_freedom_arguments(strategy):
+    @pytest.mark.parametrize("strategy_factory", [
+        lambda: LoadHoursExternalStrategy(100),
+        LoadProfileExternalStrategy,
+        lambda: PVExternalStrategy(2, capacity_kW=0.16),
+        PVUserProfileExternalStrategy,
+        PVPredefinedExternalStrategy,
+        StorageExternalStrategy])
+    def test_filter_degrees_of_freedom_arguments(strategy_factory):
         """Degrees of Freedom are correctly filtered in all external strategies."""
+        strategy = strategy_factory()
         order_arguments = {
             "type": "bid", "energy": 0.025, "price": 30, "replace_existing": True,
             "attributes": {"energy_type": "PV"}, "requirements": [{"price": 12}],
@@ -517,169 +493,82 @@ class TestExternalMixin:
 
 
 class TestForecastRelatedFeatures:
-    @pytest.mark.parametrize("ext_strategy_fixture", [LoadForecastExternalStrategy(),
-                                                      PVForecastExternalStrategy()], indirect=True)
+
+    @staticmethod
+    @pytest.fixture(autouse=True)
+    def _reset_ext_strategy(request):
+        """Reset the mutable parts of the module-scoped strategy before every test."""
+        if "ext_strategy_fixture" in request.fixturenames:
+            strategy = request.getfixturevalue("ext_strategy_fixture")
+            strategy.pending_requests = deque()
+            strategy.redis.publish_json = Mock()
+            strategy.energy_forecast_buffer = {}
+            strategy.energy_measurement_buffer = {}
+
     def test_set_energy_forecast_succeeds(self, ext_strategy_fixture):
         arguments = {"transaction_id": transaction_id,
-                     "energy_forecast": {now().format(gsy_e.constants.DATE_TIME_FORMAT): 1}}
+                     "energy_forecast": {_NOW_STR: 1}}
         payload = {"data": json.dumps(arguments)}
         assert ext_strategy_fixture.pending_requests == deque([])
         ext_strategy_fixture._set_energy_forecast(payload)
         assert len(ext_strategy_fixture.pending_requests) > 0
-        energy_forecast_response_channel = f"{ext_strategy_fixture.channel_prefix}/" \
-                                           "response/set_energy_forecast"
+        response_channel = _response_channel(ext_strategy_fixture, "set_energy_forecast")
         assert (ext_strategy_fixture.pending_requests ==
-                deque([IncomingRequest("set_energy_forecast", arguments,
-                                       energy_forecast_response_channel)]))
+                deque([IncomingRequest("set_energy_forecast", arguments, response_channel)]))
 
-    @pytest.mark.parametrize("ext_strategy_fixture", [LoadForecastExternalStrategy(),
-                                                      PVForecastExternalStrategy()], indirect=True)
     def test_set_energy_forecast_fails_for_wrong_payload(self, ext_strategy_fixture):
-        ext_strategy_fixture.redis.publish_json = Mock()
-        ext_strategy_fixture.pending_requests = deque([])
-        payload = {"data": json.dumps({"transaction_id": transaction_id})}
+        payload = _TRANSACTION_ONLY_PAYLOAD
         ext_strategy_fixture._set_energy_forecast(payload)
-        energy_forecast_response_channel = f"{ext_strategy_fixture.channel_prefix}/" \
-                                           "response/set_energy_forecast"
         ext_strategy_fixture.redis.publish_json.assert_called_with(
-            energy_forecast_response_channel, {"command": "set_energy_forecast",
-                                               "error": "Incorrect set_energy_forecast request. "
-                                                        "Available parameters: (energy_forecast).",
-                                               "transaction_id": transaction_id})
+            _response_channel(ext_strategy_fixture, "set_energy_forecast"),
+            _incorrect_request_response("set_energy_forecast"))
         assert len(ext_strategy_fixture.pending_requests) == 0
 
-    @pytest.mark.parametrize("ext_strategy_fixture", [LoadForecastExternalStrategy(),
-                                                      PVForecastExternalStrategy()], indirect=True)
     def test_set_energy_measurement_succeeds(self, ext_strategy_fixture):
         arguments = {"transaction_id": transaction_id,
-                     "energy_measurement": {now().format(gsy_e.constants.DATE_TIME_FORMAT): 1}}
+                     "energy_measurement": {_NOW_STR: 1}}
         payload = {"data": json.dumps(arguments)}
         assert ext_strategy_fixture.pending_requests == deque([])
         ext_strategy_fixture._set_energy_measurement(payload)
         assert len(ext_strategy_fixture.pending_requests) > 0
-        energy_measurement_response_channel = f"{ext_strategy_fixture.channel_prefix}/" \
-                                              "response/set_energy_measurement"
+        response_channel = _response_channel(ext_strategy_fixture, "set_energy_measurement")
         assert (ext_strategy_fixture.pending_requests ==
-                deque([IncomingRequest("set_energy_measurement", arguments,
-                                       energy_measurement_response_channel)]))
+                deque([IncomingRequest("set_energy_measurement", arguments, response_channel)]))
 
-    @pytest.mark.parametrize("ext_strategy_fixture", [LoadForecastExternalStrategy(),
-                                                      PVForecastExternalStrategy()],
-                             indirect=True)
     def test_set_energy_measurement_fails_for_wrong_payload(self, ext_strategy_fixture):
-        ext_strategy_fixture.redis.publish_json = Mock()
-        ext_strategy_fixture.pending_requests = deque([])
-        payload = {"data": json.dumps({"transaction_id": transaction_id})}
+        payload = _TRANSACTION_ONLY_PAYLOAD
         ext_strategy_fixture._set_energy_measurement(payload)
-        energy_measurement_response_channel = f"{ext_strategy_fixture.channel_prefix}/" \
-                                              "response/set_energy_measurement"
         ext_strategy_fixture.redis.publish_json.assert_called_with(
-            energy_measurement_response_channel, {"command": "set_energy_measurement",
-                                                  "error": "Incorrect set_energy_measurement"
-                                                           " request. "
-                                                  "Available parameters: (energy_measurement).",
-                                                  "transaction_id": transaction_id})
+            _response_channel(ext_strategy_fixture, "set_energy_measurement"),
+            _incorrect_request_response("set_energy_measurement"))
         assert len(ext_strategy_fixture.pending_requests) == 0
 
-    @pytest.mark.parametrize("ext_strategy_fixture", [LoadForecastExternalStrategy(),
-                                                      PVForecastExternalStrategy()], indirect=True)
-    def test_set_energy_forecast_impl_succeeds(self, ext_strategy_fixture):
-        ext_strategy_fixture.redis.publish_json = Mock()
-        arguments = {"transaction_id": transaction_id,
-                     "energy_forecast": {now().format(gsy_e.constants.DATE_TIME_FORMAT): 1}}
-        response_channel = "response_channel"
-        ext_strategy_fixture._set_energy_forecast_impl(arguments, response_channel)
-        ext_strategy_fixture.redis.publish_json.assert_called_once_with(
-            response_channel, {"command": "set_energy_forecast",
-                               "status": "ready",
-                               "transaction_id": arguments["transaction_id"]})
-
-    @pytest.mark.parametrize("ext_strategy_fixture", [LoadForecastExternalStrategy(),
-                                                      PVForecastExternalStrategy()],
-                             indirect=True)
-    def test_set_energy_forecast_impl_fails_for_wrong_time_format(self, ext_strategy_fixture):
-        ext_strategy_fixture.redis.publish_json.reset_mock()
-        response_channel = "response_channel"
-        arguments = {"transaction_id": transaction_id,
-                     "energy_forecast": {"wrong:time:format": 1}}
-        ext_strategy_fixture._set_energy_forecast_impl(arguments, response_channel)
-        error_message = ("Error when handling _set_energy_forecast_impl "
-                         f"on area {ext_strategy_fixture.device.name}. Arguments: {arguments}")
-        ext_strategy_fixture.redis.publish_json.assert_called_once_with(
-            response_channel, {"command": "set_energy_forecast",
-                               "status": "error",
-                               "transaction_id": arguments["transaction_id"],
-                               "error_message": error_message})
-
-    @pytest.mark.parametrize("ext_strategy_fixture", [LoadForecastExternalStrategy(),
-                                                      PVForecastExternalStrategy()],
-                             indirect=True)
-    def test_set_energy_forecast_impl_fails_for_negative_energy(self, ext_strategy_fixture):
-        ext_strategy_fixture.redis.publish_json.reset_mock()
-        response_channel = "response_channel"
-        arguments = {"transaction_id": transaction_id,
-                     "energy_forecast": {now().format(gsy_e.constants.DATE_TIME_FORMAT): -1}}
-        ext_strategy_fixture._set_energy_forecast_impl(arguments, response_channel)
-        error_message = ("Error when handling _set_energy_forecast_impl "
-                         f"on area {ext_strategy_fixture.device.name}. Arguments: {arguments}")
-        ext_strategy_fixture.redis.publish_json.assert_called_once_with(
-            response_channel, {"command": "set_energy_forecast",
-                               "status": "error",
-                               "transaction_id": arguments["transaction_id"],
-                               "error_message": error_message})
-
-    @pytest.mark.parametrize("ext_strategy_fixture", [LoadForecastExternalStrategy(),
-                                                      PVForecastExternalStrategy()], indirect=True)
-    def test_set_energy_measurement_impl_succeeds(self, ext_strategy_fixture):
-        # test successful call of set_energy_measurement_impl:
-        ext_strategy_fixture.redis.publish_json = Mock()
-        arguments = {"transaction_id": transaction_id,
-                     "energy_measurement": {now().format(gsy_e.constants.DATE_TIME_FORMAT): 1}}
-        response_channel = "response_channel"
-        ext_strategy_fixture._set_energy_measurement_impl(arguments, response_channel)
-        ext_strategy_fixture.redis.publish_json.assert_called_once_with(
-            response_channel, {"command": "set_energy_measurement",
-                               "status": "ready",
-                               "transaction_id": arguments["transaction_id"]})
-
-    @pytest.mark.parametrize("ext_strategy_fixture", [LoadForecastExternalStrategy(),
-                                                      PVForecastExternalStrategy()],
-                             indirect=True)
-    def test_set_energy_measurement_impl_fails_for_wrong_time_format(self, ext_strategy_fixture):
-        response_channel = "response_channel"
-        ext_strategy_fixture.redis.publish_json.reset_mock()
-        arguments = {"transaction_id": transaction_id,
-                     "energy_measurement": {"wrong:time:format": 1}}
-        ext_strategy_fixture._set_energy_measurement_impl(arguments, response_channel)
-        error_message = ("Error when handling _set_energy_measurement_impl "
-                         f"on area {ext_strategy_fixture.device.name}. Arguments: {arguments}")
-        ext_strategy_fixture.redis.publish_json.assert_called_once_with(
-            response_channel, {"command": "set_energy_measurement",
-                               "status": "error",
-                               "transaction_id": arguments["transaction_id"],
-                               "error_message": error_message})
-
-    @pytest.mark.parametrize("ext_strategy_fixture", [LoadForecastExternalStrategy(),
-                                                      PVForecastExternalStrategy()],
-                             indirect=True)
-    def test_set_energy_measurement_impl_fails_for_negative_energy(self, ext_strategy_fixture):
-        response_channel = "response_channel"
-        ext_strategy_fixture.redis.publish_json.reset_mock()
-        arguments = {"transaction_id": transaction_id,
-                     "energy_measurement": {now().format(gsy_e.constants.DATE_TIME_FORMAT): -1}}
-        ext_strategy_fixture._set_energy_measurement_impl(arguments, response_channel)
-        error_message = ("Error when handling _set_energy_measurement_impl "
-                         f"on area {ext_strategy_fixture.device.name}. Arguments: {arguments}")
+    @pytest.mark.parametrize("command_name", ["set_energy_forecast", "set_energy_measurement"])
+    @pytest.mark.parametrize("profile,status", [
+        ({_NOW_STR: 1}, "ready"),
+        ({"wrong:time:format": 1}, "error"),
+        ({"2021-01-01garbage": 1}, "error"),
+        ({_NOW_STR: -1}, "error"),
+    ], ids=["succeeds", "wrong_time_format", "malformed_time_of_day", "negative_energy"])
+    def test_set_device_energy_data_impl(self, ext_strategy_fixture, command_name, profile,
+                                         status):
+        argument_name = command_name[len("set_"):]
+        arguments = {"transaction_id": transaction_id, argument_name: profile}
+        getattr(ext_strategy_fixture, f"_{command_name}_impl")(arguments, _RESPONSE_CHANNEL)
+        response = {"command": command_name, "status": status,
+                    "transaction_id": arguments["transaction_id"]}
+        if status == "error":
+            response["error_message"] = (
+                f"Error when handling _{command_name}_impl "
+                f"on area {ext_strategy_fixture.device.name}. Arguments: {arguments}")
         ext_strategy_fixture.redis.publish_json.assert_called_once_with(
-            response_channel, {"command": "set_energy_measurement",
-                               "status": "error",
-                               "transaction_id": arguments["transaction_id"],
-                               "error_message": error_message})
+            _RESPONSE_CHANNEL, response)
 
-    @pytest.mark.parametrize("ext_strategy", [LoadForecastExternalStrategy(),
-                                              PVForecastExternalStrategy()])
+    @pytest.mark.parametrize("ext_strategy_factory", [LoadForecastExternalStrategy,
+                                                      PVForecastExternalStrategy])
     @pytest.mark.parametrize("command_name", ["set_energy_forecast", "set_energy_measurement"])
-    def test_set_device_energy_data_aggregator_succeeds(self, ext_strategy, command_name):
+    def test_set_device_energy_data_aggregator_succeeds(self, ext_strategy_factory, command_name):
+        ext_strategy = ext_strategy_factory()
         ext_strategy.owner = Mock()
         device_uuid = str(uuid.uuid4())
         ext_strategy.owner.uuid = device_uuid
@@ -699,14 +588,14 @@ class TestForecastRelatedFeatures:
             }
         )
         assert len(energy_buffer.values()) == 1
-        assert list(energy_buffer.values())[0] == 1234.0
-        assert list(energy_buffer.keys())[0] == datetime(2021, 3, 4, 12, 00)
+        assert next(iter(energy_buffer.values())) == 1234.0
+        assert next(iter(energy_buffer.keys())) == datetime(2021, 3, 4, 12, 00)
         assert return_value["command"] == command_name
         assert return_value["status"] == "ready"
         assert return_value["area_uuid"] == device_uuid
         assert command_name in return_value
         assert argument_name in return_value[command_name]
-        assert list(return_value[command_name][argument_name].values())[0] == 1234.0
+        assert next(iter(return_value[command_name][argument_name].values())) == 1234.0
 
 
 class TestAreaExternalConnectionManager:
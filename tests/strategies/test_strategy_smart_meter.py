@@ -173,6 +173,23 @@ class SmartMeterStrategyTest(unittest.TestCase):
         self.strategy._set_energy_forecast_for_future_markets.assert_called_once_with(
             reconfigure=True)
 
+    @patch("gsy_e.models.strategy.smart_meter.global_objects.profiles_handler.rotate_profile")
+    def test_read_or_rotate_profiles_does_not_reread_unchanged_raw_profile(
+            self, rotate_profile_mock):
+        """The raw profile is only preprocessed again if its content changed."""
+        profile = self._create_profile_mock()
+        rotate_profile_mock.return_value = profile
+
+        self.strategy._read_or_rotate_profiles(reconfigure=True)
+        self.strategy._read_or_rotate_profiles(reconfigure=True)
+        assert rotate_profile_mock.call_args_list[0].kwargs["profile"] == "some_path.csv"
+        # The already preprocessed profile is only rotated
+        assert rotate_profile_mock.call_args_list[1].kwargs["profile"] is profile
+
+        self.strategy.smart_meter_profile = "another_path.csv"
+        self.strategy._read_or_rotate_profiles(reconfigure=True)
+        assert rotate_profile_mock.call_args_list[2].kwargs["profile"] == "another_path.csv"
+
     @patch("gsy_e.models.strategy.BidEnabledStrategy.event_market_cycle")
     def test_event_market_cycle(self, super_method_mock):
         """event_market_cycle calls the expected interfaces."""
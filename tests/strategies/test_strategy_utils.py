@@ -13,7 +13,11 @@ General Public License for more details.
 You should have received a copy of the GNU General Public License along with this program. If not,
 see <http://www.gnu.org/licenses/>.
 """
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
+
+import pytest
+from gsy_framework.constants_limits import GlobalConfig
+from pendulum import datetime
 
 from gsy_e.models.strategy import utils
 
@@ -42,3 +46,17 @@ class TestStrategyUtils:
         # Return 0 when the new energy flips the sign of the original
         assert utils.compute_altered_energy(
             -1000, relative_std=10, random_generator=random_generator_mock) < 0
+
+    @staticmethod
+    @pytest.mark.parametrize("is_canary_network, time_slot, expected_value", [
+        (False, datetime(2021, 3, 4, 12), 1),
+        (False, datetime(2021, 3, 11, 12), 3),
+        (True, datetime(2021, 3, 4, 12), 3),
+    ])
+    @patch("gsy_e.models.strategy.utils.find_object_of_same_weekday_and_time",
+           Mock(return_value=3))
+    def test_get_profile_value_at_time_slot(is_canary_network, time_slot, expected_value):
+        """Test that exact time slot keys are only used outside of the Canary Network."""
+        profile = {datetime(2021, 3, 4, 12): 1, datetime(2021, 3, 4, 12, 15): 2}
+        with patch.object(GlobalConfig, "IS_CANARY_NETWORK", is_canary_network):
+            assert utils.get_profile_value_at_time_slot(profile, time_slot) == expected_value
@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError, ResponseError
+from rq.utils import utcformat
+
+from gsy_e.gsy_e_core.launcher import Launcher
+
+
+class _StopLauncher(Exception):
+    """Raised by the mocked pubsub to leave the otherwise endless launcher loop."""
+
+
+@pytest.fixture(name="redis_connection")
+def redis_connection_fixture():
+    redis_connection = MagicMock()
+    redis_connection.connection_pool.connection_kwargs = {"db": 0}
+    redis_connection.config_get.return_value = {"notify-keyspace-events": ""}
+    with patch("gsy_e.gsy_e_core.launcher.StrictRedis.from_url",
+               return_value=redis_connection):
+        yield redis_connection
+
+
+@pytest.fixture(name="launcher")
+def launcher_fixture(redis_connection):
+    with patch("gsy_e.gsy_e_core.launcher.Queue") as queue_cls:
+        queue_cls.return_value.key = "rq:queue:simulations"
+        queue_cls.return_value.job_class.redis_job_namespace_prefix = "rq:job:"
+        launcher = Launcher(max_jobs=1, max_delay_seconds=2)
+    launcher._start_worker = Mock(side_effect=lambda: Mock())
+    return launcher
+
+
+class TestLauncher:
+
+    @pytest.mark.parametrize("current_flags, expected_flags", [
+        ("", "Kl"),
+        ("Ex", "ExKl"),
+        ("KEA", "KEAl"),
+    ])
+    def test_subscribe_merges_keyspace_event_flags(
+            self, launcher, redis_connection, current_flags, expected_flags):
+        redis_connection.config_get.return_value = {"notify-keyspace-events": current_flags}
+        launcher._subscribe_to_queue_events()
+        redis_connection.config_set.assert_called_once_with(
+            "notify-keyspace-events", expected_flags)
+        redis_connection.pubsub.return_value.subscribe.assert_called_once_with(
+            "__keyspace@0__:rq:queue:simulations")
+
+    def test_subscribe_keeps_keyspace_event_flags_if_already_enabled(
+            self, launcher, redis_connection):
+        redis_connection.config_get.return_value = {"notify-keyspace-events": "lKEx"}
+        launcher._subscribe_to_queue_events()
+        redis_connection.config_set.assert_not_called()
+
+    def test_subscribe_tolerates_refused_config_commands(self, launcher, redis_connection):
+        redis_connection.config_get.side_effect = ResponseError()
+        launcher._subscribe_to_queue_events()
+        redis_connection.pubsub.return_value.subscribe.assert_called_once()
+
+    @patch("gsy_e.gsy_e_core.launcher.check_redis_health", Mock())
+    @patch("gsy_e.gsy_e_core.launcher.datetime")
+    def test_is_queue_crowded_compares_head_job_with_max_delay(self, datetime_mock, launcher):
+        utc_now = datetime(2021, 3, 4, 12, 0, 1)
+        datetime_mock.utcnow.return_value = utc_now
+        launcher._is_queue_crowded_script = Mock(return_value=1)
+        assert launcher.is_queue_crowded() is True
+        launcher._is_queue_crowded_script.assert_called_once_with(
+            keys=["rq:queue:simulations"],
+            args=["rq:job:", utcformat(utc_now - timedelta(seconds=2))])
+
+        launcher._is_queue_crowded_script.return_value = 0
+        assert launcher.is_queue_crowded() is False
+
+    @pytest.mark.parametrize("earlier, later", [
+        (datetime(2021, 3, 4, 9, 59, 59, 999999), datetime(2021, 3, 4, 10, 0, 0)),
+        (datetime(2021, 9, 30, 23, 59, 59), datetime(2021, 10, 1, 0, 0, 0)),
+        (datetime(2021, 3, 4, 12, 0, 0), datetime(2021, 3, 4, 12, 0, 0, 1)),
+    ])
+    def test_enqueued_at_format_sorts_like_time(self, earlier, later):
+        # The crowding script compares enqueued_at timestamps as strings
+        assert utcformat(earlier) < utcformat(later)
+
+    def test_run_reaps_finished_workers_before_capacity_check(self, launcher, redis_connection):
+        finished_worker = Mock(poll=Mock(return_value=0))
+        launcher._start_worker = Mock(side_effect=[finished_worker, Mock()])
+        launcher.is_queue_crowded = Mock(return_value=True)
+        redis_connection.pubsub.return_value.get_message.side_effect = [None, _StopLauncher]
+        with pytest.raises(_StopLauncher):
+            launcher.run()
+        assert launcher._start_worker.call_count == 2
+        assert finished_worker not in launcher.job_array
+
+    def test_run_does_not_exceed_max_jobs(self, launcher, redis_connection):
+        launcher.is_queue_crowded = Mock(return_value=True)
+        launcher._start_worker = Mock(return_value=Mock(poll=Mock(return_value=None)))
+        redis_connection.pubsub.return_value.get_message.side_effect = [None, _StopLauncher]
+        with pytest.raises(_StopLauncher):
+            launcher.run()
+        launcher._start_worker.assert_called_once()
+        launcher.is_queue_crowded.assert_not_called()
+
+    @patch("gsy_e.gsy_e_core.launcher.sleep")
+    def test_run_resubscribes_after_dropped_connection(
+            self, sleep_mock, launcher, redis_connection):
+        launcher.is_queue_crowded = Mock(return_value=False)
+        pubsub = redis_connection.pubsub.return_value
+        pubsub.get_message.side_effect = [RedisConnectionError(), _StopLauncher]
+        with pytest.raises(_StopLauncher):
+            launcher.run()
+        sleep_mock.assert_called_once_with(2)
+        pubsub.close.assert_called_once()
+        assert redis_connection.pubsub.call_count == 2
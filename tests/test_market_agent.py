@@ -29,6 +29,7 @@ from gsy_framework.constants_limits import ConstSettings
 from gsy_framework.data_classes import Bid, MarketClearingState, Offer, Trade
 
 from gsy_e.constants import TIME_FORMAT, TIME_ZONE
+from gsy_e.gsy_e_core.exceptions import MarketException
 from gsy_e.models.area import DEFAULT_CONFIG
 from gsy_e.models.market import GridFee
 from gsy_e.models.market.grid_fees.base_model import GridFees
@@ -699,3 +700,71 @@ class TestMAOffer:
         offer_info = engine.forwarded_offers[residual_offer_id]
         assert offer_info.source_offer.id == "uuid"
         assert offer_info.target_offer.id == residual_offer_id
+
+
+class TestMAEngine:
+
+    @staticmethod
+    @pytest.fixture(name="market_agent_engine")
+    def market_agent_engine_fixture():
+        """Return a market agent and its engine forwarding offers from the lower market."""
+        lower_market = FakeMarket([Offer("id", pendulum.now(), 1, 1, "other", 1)], m_id=123)
+        higher_market = FakeMarket([], m_id=234)
+        owner = FakeArea("owner")
+        maa = OneSidedAgent(owner=owner, higher_market=higher_market, lower_market=lower_market,
+                            min_offer_age=2)
+        engine = next(e for e in maa.engines if e.markets.source is lower_market)
+        return maa, engine
+
+    @staticmethod
+    def _tick(market_agent, engine, current_tick):
+        market_agent.owner.current_tick = current_tick
+        engine.tick(area=market_agent.owner)
+
+    def test_ma_engine_forwards_offer_exactly_at_min_offer_age(self, market_agent_engine):
+        maa, engine = market_agent_engine
+        for current_tick in (10, 11):
+            self._tick(maa, engine, current_tick)
+            assert maa.higher_market.offer_call_count == 0
+        self._tick(maa, engine, 12)
+        assert maa.higher_market.offer_call_count == 1
+        assert "id" in engine.forwarded_offers
+
+    def test_ma_engine_does_not_forward_offer_twice(self, market_agent_engine):
+        maa, engine = market_agent_engine
+        for current_tick in range(10, 16):
+            self._tick(maa, engine, current_tick)
+        assert maa.higher_market.offer_call_count == 1
+
+    @pytest.mark.parametrize("notify_engine", [True, False])
+    def test_ma_engine_skips_offer_removed_from_source_market(
+            self, market_agent_engine, notify_engine):
+        maa, engine = market_agent_engine
+        self._tick(maa, engine, 10)
+        offer = maa.lower_market.offers.pop("id")
+        if notify_engine:
+            # Leaves a stale entry for the offer in the age heap
+            engine.event_offer_deleted(offer=offer)
+        self._tick(maa, engine, 12)
+        assert maa.higher_market.offer_call_count == 0
+        assert "id" not in engine.offer_age
+        assert "id" not in engine.forwarded_offers
+
+    def test_ma_engine_retries_failed_forward_on_next_tick(self, market_agent_engine):
+        maa, engine = market_agent_engine
+        market_offer = maa.higher_market.offer
+
+        def _fail_once(**kwargs):
+            maa.higher_market.offer = market_offer
+            raise MarketException()
+
+        maa.higher_market.offer = _fail_once
+        self._tick(maa, engine, 10)
+        self._tick(maa, engine, 12)
+        assert maa.higher_market.offer_call_count == 0
+        assert "id" not in engine.forwarded_offers
+        assert "id" in engine.offer_age
+
+        self._tick(maa, engine, 13)
+        assert maa.higher_market.offer_call_count == 1
+        assert "id" in engine.forwarded_offers